@@ -0,0 +1,12 @@
+"""
+    Benchmarks for the solver engines, the board files and the rendering.
+    
+    Usage:
+        python -m benchmarks [--quick] [--only nqueens,colored,io,render] [--output results.json]
+        python -m benchmarks --save-baseline
+        python -m benchmarks --baseline benchmarks/baseline.json [--threshold 0.1]
+    
+    Made by: NIHAL T P
+    GitHub: https://github.com/nihaltp
+    LinkedIn: https://www.linkedin.com/in/nihal-tp
+"""
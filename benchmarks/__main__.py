@@ -0,0 +1,117 @@
+"""
+    Run the benchmarks, save the results as JSON and compare them with a baseline.
+    
+    Made by: NIHAL T P
+    GitHub: https://github.com/nihaltp
+    LinkedIn: https://www.linkedin.com/in/nihal-tp
+"""
+
+import os
+import sys
+import json
+import platform
+import argparse
+import datetime
+
+from benchmarks.suites import SUITES
+
+BASELINE: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# MARK: run
+def run(names: list[str], quick: bool) -> dict:
+    """
+    Run benchmark suites.
+    
+    @param names: The suites to run, see suites.SUITES.
+    @param quick: Use smaller inputs.
+    @return: {"meta": {...}, "results": {benchmark name: result}}
+    """
+    results: dict[str, dict] = {}
+    for name in names:
+        print(f"\033[94mRunning {name}...\033[0m", file = sys.stderr)
+        results.update(SUITES[name](quick))
+    
+    meta: dict = {
+        "date": datetime.datetime.now().isoformat(timespec = "seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "quick": quick,
+    }
+    return {"meta": meta, "results": results}
+
+# MARK: compare
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Compare the best times of two runs.
+    
+    @param current  : The results of this run.
+    @param baseline : The results to compare with.
+    @param threshold: How much slower a benchmark may get, 0.1 is 10%.
+    @return: The names of the benchmarks that got slower than the threshold.
+    """
+    slower: list[str] = []
+    for name, result in current["results"].items():
+        old: dict | None = baseline["results"].get(name)
+        if old is None or "best" not in result or "best" not in old or not old["best"]:
+            continue
+        
+        ratio: float = result["best"] / old["best"]
+        if ratio > 1 + threshold:
+            color: str = "\033[91m"
+            slower.append(name)
+        elif ratio < 1 - threshold:
+            color = "\033[92m"
+        else:
+            color = "\033[0m"
+        print(f"{color}{name:50} {old['best'] * 1000:10.3f} ms -> {result['best'] * 1000:10.3f} ms ({ratio:.2f}x)\033[0m", file = sys.stderr)
+    return slower
+
+# MARK: main
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog = "python -m benchmarks", description = "N Queens benchmarks.")
+    parser.add_argument("--only", default = ",".join(SUITES), help = f"comma separated suites to run, from {', '.join(SUITES)}")
+    parser.add_argument("--quick", action = "store_true", help = "smaller inputs, for a fast check")
+    parser.add_argument("--output", default = None, help = "file to save the results to")
+    parser.add_argument("--baseline", default = None, help = f"results to compare with, {BASELINE} if it exists")
+    parser.add_argument("--save-baseline", action = "store_true", help = f"save the results as the baseline, {BASELINE}")
+    parser.add_argument("--threshold", type = float, default = 0.1, help = "slowdown that fails the comparison, 0.1 is 10%%")
+    args = parser.parse_args(argv)
+    
+    names: list[str] = [name.strip() for name in args.only.split(",") if name.strip()]
+    unknown: list[str] = [name for name in names if name not in SUITES]
+    if unknown:
+        parser.error(f"unknown suites: {', '.join(unknown)}")
+    
+    current: dict = run(names, args.quick)
+    text: str = json.dumps(current, indent = 2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    if args.save_baseline:
+        with open(BASELINE, "w") as f:
+            f.write(text + "\n")
+        print(f"\033[92mBaseline saved to {BASELINE}.\033[0m", file = sys.stderr)
+    if not args.output and not args.save_baseline:
+        print(text)
+    
+    baseline_file: str | None = args.baseline or (BASELINE if os.path.exists(BASELINE) and not args.save_baseline else None)
+    if baseline_file is None:
+        return 0
+    
+    with open(baseline_file, "r") as f:
+        baseline: dict = json.load(f)
+    slower: list[str] = compare(current, baseline, args.threshold)
+    if slower:
+        print(f"\033[91m{len(slower)} benchmarks are more than {args.threshold:.0%} slower than {baseline_file}.\033[0m", file = sys.stderr)
+        return 1
+    print(f"\033[92mNo benchmark is more than {args.threshold:.0%} slower than {baseline_file}.\033[0m", file = sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print("\033[93mCtrl+C detected! Exiting...\033[0m")
+        sys.exit(1)
@@ -0,0 +1,197 @@
+"""
+    The benchmark suites.
+    
+    Every suite is a function taking quick (smaller inputs, for a fast check) and returning
+    {benchmark name: result}. A result has the best and median time of its repeats in seconds,
+    and may have more numbers about the run (counts, throughput).
+    
+    Made by: NIHAL T P
+    GitHub: https://github.com/nihaltp
+    LinkedIn: https://www.linkedin.com/in/nihal-tp
+"""
+
+import os
+import sys
+import glob
+import contextlib
+import random
+import statistics
+import tempfile
+import time
+from typing import Callable
+
+from boards.board_store import BoardStore, board_filename, parse_board
+from boards.load_board import BinaryBoards
+from boards.save_board import save_binary_boards
+from queens import colored, generator, nqueens
+
+# MARK: measure
+def measure(function: Callable[[], object], repeat: int = 5, **extra) -> dict:
+    """
+    Time a function.
+    
+    @param function: The function to time, called without arguments.
+    @param repeat  : Number of times to call it.
+    @param extra   : More numbers to keep with the result.
+    @return: {"best", "median", "repeat", **extra}, times in seconds.
+    """
+    times: list[float] = []
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return {"best": min(times), "median": statistics.median(times), "repeat": repeat, **extra}
+
+# MARK: nqueens_suite
+def nqueens_suite(quick: bool = False) -> dict[str, dict]:
+    """Count the N Queens solutions for N = 4 to 14 (4 to 10 when quick), plain and with the symmetries."""
+    results: dict[str, dict] = {}
+    for size in range(4, 11 if quick else 15):
+        repeat: int = 5 if size <= 10 else 1
+        results[f"nqueens.count_symmetric[{size}]"] = measure(lambda: nqueens.count_symmetric(size), repeat)
+        if size <= 12:
+            results[f"nqueens.count_solutions[{size}]"] = measure(lambda: nqueens.count_solutions(size), repeat)
+    return results
+
+# MARK: colored_suite
+def colored_suite(quick: bool = False) -> dict[str, dict]:
+    """
+    Solve the colored boards of boards/board_<size>.txt, and check the uniqueness of generated puzzles
+    (the same puzzles every run, the generating time is not measured).
+    """
+    results: dict[str, dict] = {}
+    for filename in sorted(glob.glob(board_filename("*"))):
+        size: int = int(os.path.basename(filename)[len("board_") : -len(".txt")])
+        boards: list[list[list[int]]] = []
+        with BoardStore(size, filename) as store:
+            for board_id in range(min(len(store), 200 if quick else len(store))):
+                try:
+                    boards.append(parse_board(store.get_line(board_id), size))
+                except ValueError:
+                    continue
+        if boards:
+            results[f"colored.solve[corpus {size}]"] = measure(lambda: [colored.solve(board) for board in boards], 3,
+                                                               boards = len(boards))
+    
+    for size in (6, 8, 10) if quick else (6, 8, 10, 12):
+        puzzles: list[list[list[int]]] = [generator.generate_puzzle(size, seed) for seed in range(5 if quick else 20)]
+        results[f"colored.count_solutions[generated {size}]"] = measure(
+            lambda: [colored.count_solutions(puzzle, 2) for puzzle in puzzles], 3, boards = len(puzzles))
+    return results
+
+# MARK: io_suite
+def io_suite(quick: bool = False) -> dict[str, dict]:
+    """Save, index and read a large board file, in text and binary form, in a temporary folder."""
+    size: int = 8
+    count: int = 5_000 if quick else 50_000
+    reads: int = 10_000
+    rng = random.Random(0)
+    boards: list[list[list[int]]] = [generator.grow_regions(size, generator.random_queens(size, rng), rng)
+                                     for _ in range(count)]
+    
+    results: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory() as folder:
+        text: str = os.path.join(folder, f"board_{size}.txt")
+        binary: str = os.path.join(folder, f"board_{size}.bin")
+        
+        def save_text() -> None:
+            for name in os.listdir(folder):
+                os.remove(os.path.join(folder, name))
+            open(text, "w").close()
+            with BoardStore(size, text) as store:
+                store.append(boards)
+        results["io.text.save"] = measure(save_text, 3, boards = count)
+        
+        def index_text() -> None:
+            for ext in (".idx", ".hash"):
+                if os.path.exists(os.path.splitext(text)[0] + ext):
+                    os.remove(os.path.splitext(text)[0] + ext)
+            with BoardStore(size, text) as store:
+                boards[0] in store  # the hash file is only built on the first lookup
+        results["io.text.build_index"] = measure(index_text, 3, boards = count)
+        
+        with BoardStore(size, text) as store:
+            results["io.text.open"] = measure(lambda: BoardStore(size, text).close(), 5, boards = count)
+            results["io.text.random_read"] = measure(lambda: [store.random_board() for _ in range(reads)], 3, reads = reads)
+            results["io.text.lookup"] = measure(lambda: [board in store for board in boards[:reads]], 3,
+                                                lookups = min(reads, count))
+        
+        def save_binary() -> None:
+            if os.path.exists(binary):
+                os.remove(binary)
+            save_binary_boards(size, boards, binary)
+        results["io.binary.save"] = measure(save_binary, 3, boards = count)
+        
+        with BinaryBoards(size, binary) as stored:
+            results["io.binary.open"] = measure(lambda: BinaryBoards(size, binary).close(), 5, boards = count)
+            results["io.binary.random_read"] = measure(lambda: [stored.random_board() for _ in range(reads)], 3, reads = reads)
+        
+        results["io.text_size_per_board"] = {"bytes": os.path.getsize(text) / count}
+        results["io.binary_size_per_board"] = {"bytes": os.path.getsize(binary) / count}
+    return results
+
+# MARK: render_suite
+def render_suite(quick: bool = False) -> dict[str, dict]:
+    """Draw solver frames with the SDL dummy video driver, nothing is shown on the screen."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import main
+    
+    size: int = 8
+    frames: int = 500 if quick else 2000
+    
+    # the solver window without asking for a size or a mode, and without starting a game
+    class RenderSolver(main.solver):
+        def input_num(self, *args, **kwargs) -> int:
+            return size
+        
+        def get_mode(self, *args, **kwargs) -> str:
+            return "Simulation"
+        
+        def game(self) -> None:
+            pass
+    
+    # keep the messages of the game out of the results printed on stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        screen = RenderSolver()
+    
+    # the first steps of the search, every step is a frame
+    states: list[list[int]] = []
+    for _, board in nqueens.search(size):
+        states.append(list(board))
+        if len(states) == frames:
+            break
+    
+    def incremental() -> None:
+        screen.drawn_squares.clear()
+        for board in states:
+            screen.draw_board(board)
+    
+    def full() -> None:
+        for board in states:
+            screen.drawn_squares.clear()  # forget the last frame, every square is drawn again
+            screen.draw_board(board)
+    
+    results: dict[str, dict] = {
+        "render.draw_board.incremental": measure(incremental, 3, frames = frames),
+        "render.draw_board.full": measure(full, 3, frames = frames),
+    }
+    
+    # a colored board with queens and x marks on it
+    screen.color_board = generator.generate_puzzle(size, 0)
+    screen.colors = {color: (40 * color % 256, 90 * color % 256, 150 * color % 256) for color in range(1, size + 1)}
+    screen.color_board_state = [["" for _ in range(size)] for _ in range(size)]
+    for row, column in enumerate(colored.solve(screen.color_board)):
+        screen.color_board_state[row][column] = "q"
+        screen.color_board_state[(row + 1) % size][column] = "x"
+    color_frames: int = frames // 4
+    results["render.draw_color_board"] = measure(lambda: [screen.draw_color_board() for _ in range(color_frames)], 3,
+                                                 frames = color_frames)
+    return results
+
+SUITES: dict[str, Callable[[bool], dict[str, dict]]] = {
+    "nqueens": nqueens_suite,
+    "colored": colored_suite,
+    "io": io_suite,
+    "render": render_suite,
+}
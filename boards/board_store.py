@@ -0,0 +1,382 @@
+"""
+    This module provides random access to the boards of a board_<size>.txt file.
+    
+    The text file stays the source of truth, one board per line. Next to it a board_<size>.idx file keeps
+    the byte offset of every board, so a board is one seek and one readline away instead of a read of
+    the whole file. Boards added with save_board are indexed from where the last update stopped.
+    The index also keeps the modification time of the text file, when the file was changed by anything
+    else (e.g. edited by hand) the index and the hash file are made again from the start.
+    
+    A board_<size>.hash file keeps a 16 byte digest of every board in the same way, so checking if a
+    board is already saved is a set lookup. It is only read when a board is looked up or added.
+    The digest is taken from the canonical form of the board, so a board that is a rotation or a mirror
+    of a saved one, or the same board with its colors numbered differently, counts as already saved.
+    
+    Boards can also be kept in a board_<size>.bin file, one byte per cell and the same number of bytes
+    for every board, written by save_board and read through mmap by load_board. Text files are
+    converted with convert_board_file in save_board.
+    
+    Binary board files:
+        magic       : 4 bytes, b"QBD1"
+        board_size  : 1 byte
+        padding     : 3 bytes
+        count       : 8 bytes, little endian
+        records     : count * board_size * board_size bytes, the colors row by row
+    
+    Index and hash files:
+        magic       : 4 bytes, b"BIX2" or b"BHS3"
+        padding     : 4 bytes
+        indexed     : 8 bytes, little endian, size of the text file when it was indexed
+        stamp       : 8 bytes, little endian, modification time of the text file in ns when it was indexed
+        records     : the start of every non-empty line as 8 bytes, little endian, or its 16 byte digest
+    
+    Made by: NIHAL T P
+    GitHub: https://github.com/nihaltp
+    LinkedIn: https://www.linkedin.com/in/nihal-tp
+"""
+
+import os
+import sys
+import random
+import struct
+import hashlib
+import functools
+from array import array
+
+MAGIC       : bytes = b"BIX2"
+HASH_MAGIC  : bytes = b"BHS3"
+HEADER      : struct.Struct = struct.Struct("<4s4xQQ")
+DIGEST_SIZE : int = 16
+
+BINARY_MAGIC : bytes = b"QBD1"
+BINARY_HEADER: struct.Struct = struct.Struct("<4sB3xQ")
+
+# MARK: board_filename
+def board_filename(board_size: int, ext: str = ".txt") -> str:
+    """
+    Get the path of the file holding the boards of a size.
+    
+    @param board_size: The size of the boards.
+    @param ext       : The extension of the file.
+    @return: The path of board_<size><ext> next to this file.
+    """
+    # Get the directory where *this file* is located
+    base_dir = os.path.dirname(__file__)  # <- This will always point to where this file is located
+    return os.path.join(base_dir, f"board_{board_size}{ext}")
+
+# MARK: parse_board
+def parse_board(line: str, board_size: int) -> list[list[int]]:
+    """
+    Parse a board written by save_board, faster than ast.literal_eval.
+    
+    @param line      : A line like "[[1, 2], [2, 1]]".
+    @param board_size: The size of the board.
+    @return: The board.
+    """
+    text: str = line.strip()
+    if not (text.startswith("[[") and text.endswith("]]")):
+        raise ValueError("Line is not a valid list.")
+    
+    numbers: list[int] = [int(number) for number in text.replace("[", "").replace("]", "").split(",")]
+    if len(numbers) != board_size * board_size:
+        raise ValueError(f"Expected {board_size * board_size} numbers, got {len(numbers)}.")
+    return [numbers[i : i + board_size] for i in range(0, len(numbers), board_size)]
+
+# MARK: canonical_board
+def canonical_board(board: list[list[int]]) -> list[list[int]]:
+    """
+    Get the same form for every board that is the same puzzle: of the 8 rotations and mirrors of the
+    board, with the colors renumbered in the order they first appear, the smallest one.
+    
+    @param board: The board.
+    @return: The canonical board, with colors from 1 to board_size.
+    """
+    size: int = len(board)
+    cells: list[int] = [color for row in board for color in row]
+    best: list[int] | None = None
+    for order in _symmetry_orders(size):
+        labels: dict[int, int] = {}
+        form: list[int] = [labels.setdefault(cells[i], len(labels) + 1) for i in order]
+        if best is None or form < best:
+            best = form
+    return [best[i : i + size] for i in range(0, size * size, size)]
+
+# MARK: _symmetry_orders
+@functools.lru_cache(maxsize = None)
+def _symmetry_orders(size: int) -> list[list[int]]:
+    """Get the cells of the 8 rotations and mirrors of a board, in reading order, as indexes into the flat board."""
+    orders: list[list[int]] = []
+    for transform in (lambda x, y: (x, y), lambda x, y: (y, size - 1 - x),
+                      lambda x, y: (size - 1 - x, size - 1 - y), lambda x, y: (size - 1 - y, x)):
+        for mirror in (False, True):
+            order: list[int] = []
+            for x in range(size):
+                for y in range(size):
+                    i, j = transform(x, size - 1 - y if mirror else y)
+                    order.append(i * size + j)
+            orders.append(order)
+    return orders
+
+# MARK: board_digest
+def board_digest(board: list[list[int]]) -> bytes:
+    """
+    Get the key used to find duplicate boards, the digest of the canonical form of the board.
+    
+    @param board: The board.
+    @return: A 16 byte digest.
+    """
+    return hashlib.blake2b(str(canonical_board(board)).encode(), digest_size = DIGEST_SIZE).digest()
+
+# MARK: BoardStore
+class BoardStore:
+    """
+    Random access to the boards of one size.
+    
+    Usage:
+        with BoardStore(8) as store:
+            print(len(store), store.get(0), store.random_board())
+    """
+    
+    def __init__(self, board_size: int, filename: str | None = None) -> None:
+        self.board_size: int = board_size
+        self.filename  : str = filename or board_filename(board_size)
+        self.index_name: str = os.path.splitext(self.filename)[0] + ".idx"
+        self.offsets   : array = array("Q")
+        self.indexed   : int = 0  # bytes of the text file covered by offsets, a last line without its newline is after it
+        self.stamp     : int = 0  # st_mtime_ns of the text file when it was indexed
+        self.hash_name : str = os.path.splitext(self.filename)[0] + ".hash"
+        self.digests   : set[bytes] | None = None  # loaded on the first lookup
+        self.hashed    : int = 0  # bytes of the text file covered by digests
+        
+        self.file = open(self.filename, "rb")  # FileNotFoundError if there are no boards of this size
+        self._load_index()
+        self.refresh()
+    
+    def __len__(self) -> int:
+        return len(self.offsets)
+    
+    def __contains__(self, board: list[list[int]]) -> bool:
+        self.refresh()
+        digest: bytes = board_digest(board)
+        return digest in self._load_digests() or digest == self._trailing_digest()
+    
+    def __enter__(self) -> "BoardStore":
+        return self
+    
+    def __exit__(self, *args) -> None:
+        self.close()
+    
+    # MARK: get
+    def get(self, board_id: int) -> list[list[int]]:
+        """
+        Get a board by its id, the position of its line among the non-empty lines of the file.
+        
+        @param board_id: The id of the board, negative ids count from the end.
+        @return: The board.
+        """
+        return parse_board(self.get_line(board_id), self.board_size)
+    
+    # MARK: get_line
+    def get_line(self, board_id: int) -> str:
+        """
+        Get the line of a board without parsing it.
+        
+        @param board_id: The id of the board, negative ids count from the end.
+        @return: The line, without the newline.
+        """
+        self.file.seek(self.offsets[board_id])  # IndexError for an unknown id
+        return self.file.readline().decode().strip()
+    
+    # MARK: random_board
+    def random_board(self) -> list[list[int]]:
+        """
+        Get a random board.
+        
+        @return: The board.
+        """
+        if not self.offsets:
+            raise IndexError(f"No boards found in {self.filename}.")
+        return self.get(random.randrange(len(self.offsets)))
+    
+    # MARK: refresh
+    def refresh(self) -> None:
+        """
+        Index the lines added to the text file since the last update, or all of them if it was changed by anything else.
+        """
+        stat = os.fstat(self.file.fileno())
+        size: int = stat.st_size
+        
+        # a last line without its newline is indexed but not covered by indexed, it is read again every time
+        trailing: bool = bool(self.offsets) and self.offsets[-1] >= self.indexed
+        if trailing:
+            self.offsets.pop()
+        if size == self.indexed and stat.st_mtime_ns == self.stamp:
+            if trailing:
+                self._save_index()
+            return
+        
+        # append updates the stamp after writing, any other change of the file (even one keeping every line
+        # ending where it was, like a board replaced by another of the same length) means starting over
+        if stat.st_mtime_ns != self.stamp or size < self.indexed or (self.indexed and not self._ends_line(self.indexed)):
+            self.offsets = array("Q")
+            self.indexed = 0
+            self.digests = set()  # hashed again from the start, not from the hash file
+            self.hashed  = 0
+        
+        self.file.seek(self.indexed)
+        offset: int = self.indexed
+        for line in self.file:
+            if line.strip():
+                self.offsets.append(offset)
+            offset += len(line)
+            # an unfinished last line stays after indexed, so it is checked again once it is complete
+            if not line.endswith(b"\n"):
+                offset -= len(line)
+                break
+        self.indexed = offset
+        self.stamp   = stat.st_mtime_ns
+        self._save_index()
+    
+    # MARK: append
+    def append(self, boards: list[list[list[int]]]) -> list[list[list[int]]]:
+        """
+        Add the boards that are not saved yet to the end of the text file, with one write.
+        The boards are not validated, see save_board.
+        
+        @param boards: The boards to add, a board that is the same puzzle as a saved one is skipped.
+        @return: The boards added.
+        """
+        self.refresh()
+        digests: set[bytes] = self._load_digests()
+        trailing: bytes | None = self._trailing_digest()
+        
+        added: list[list[list[int]]] = []
+        for board in boards:
+            digest: bytes = board_digest(board)
+            if digest not in digests and digest != trailing:
+                digests.add(digest)
+                added.append(board)
+        if not added:
+            return added
+        
+        # a last line without its newline would be joined with the first new board
+        size: int = os.fstat(self.file.fileno()).st_size
+        separator: str = "\n" if size and not self._ends_line(size) else ""
+        with open(self.filename, "a") as f:
+            f.write(separator + "\n".join(str(board) for board in added) + "\n")
+        self.stamp = os.fstat(self.file.fileno()).st_mtime_ns  # only this write changed the file, index it from where it stopped
+        
+        # the digests of the new lines are already in the set, and the last line is complete now
+        if trailing is not None:
+            digests.add(trailing)
+        self.refresh()
+        self.hashed = self.indexed
+        self._save_digests()
+        return added
+    
+    # MARK: close
+    def close(self) -> None:
+        self.file.close()
+    
+    # MARK: _ends_line
+    def _ends_line(self, position: int) -> bool:
+        self.file.seek(position - 1)
+        return self.file.read(1) == b"\n"
+    
+    # MARK: _load_index
+    def _load_index(self) -> None:
+        try:
+            with open(self.index_name, "rb") as f:
+                data: bytes = f.read()
+        except OSError:
+            return
+        
+        if len(data) < HEADER.size or (len(data) - HEADER.size) % self.offsets.itemsize:
+            return
+        magic, indexed, stamp = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            return
+        
+        offsets = array("Q")
+        offsets.frombytes(data[HEADER.size:])
+        if sys.byteorder == "big":
+            offsets.byteswap()
+        self.offsets = offsets
+        self.indexed = indexed
+        self.stamp   = stamp
+    
+    # MARK: _save_index
+    def _save_index(self) -> None:
+        offsets = array("Q", self.offsets)
+        if sys.byteorder == "big":
+            offsets.byteswap()
+        _write_sidecar(self.index_name, HEADER.pack(MAGIC, self.indexed, self.stamp) + offsets.tobytes())
+    
+    # MARK: _load_digests
+    def _load_digests(self) -> set[bytes]:
+        """Get the digests of every indexed board, hashing only the lines added since the hash file was saved."""
+        if self.digests is None:
+            self.digests = set()
+            self.hashed = 0
+            try:
+                with open(self.hash_name, "rb") as f:
+                    data: bytes = f.read()
+                magic, hashed, stamp = HEADER.unpack_from(data)
+                # the hash file is only trusted if it was saved for the same version of the text file as the index
+                if (magic == HASH_MAGIC and not (len(data) - HEADER.size) % DIGEST_SIZE and stamp == self.stamp
+                        and hashed <= self.indexed and (hashed == 0 or self._ends_line(hashed))):
+                    self.digests = {data[i : i + DIGEST_SIZE] for i in range(HEADER.size, len(data), DIGEST_SIZE)}
+                    self.hashed = hashed
+            except (OSError, struct.error):
+                pass
+        
+        if self.hashed != self.indexed:
+            self.file.seek(self.hashed)
+            for line in self.file.read(self.indexed - self.hashed).splitlines():
+                if line.strip():
+                    self.digests.add(self._line_digest(line.decode()))
+            self.hashed = self.indexed
+            self._save_digests()
+        return self.digests
+    
+    # MARK: _trailing_digest
+    def _trailing_digest(self) -> bytes | None:
+        """Get the digest of a last line without its newline, None if the file ends with a newline."""
+        if not self.offsets or self.offsets[-1] < self.indexed:
+            return None
+        return self._line_digest(self.get_line(-1))
+    
+    # MARK: _line_digest
+    def _line_digest(self, line: str) -> bytes:
+        try:
+            return board_digest(parse_board(line, self.board_size))
+        except ValueError:
+            # a line that is not a board only matches the same text
+            return hashlib.blake2b(line.strip().encode(), digest_size = DIGEST_SIZE).digest()
+    
+    # MARK: _save_digests
+    def _save_digests(self) -> None:
+        _write_sidecar(self.hash_name, HEADER.pack(HASH_MAGIC, self.hashed, self.stamp) + b"".join(self.digests))
+
+# MARK: _write_sidecar
+def _write_sidecar(filename: str, data: bytes) -> None:
+    # write next to the file and rename, so a reader never sees half of it
+    temporary: str = f"{filename}.{os.getpid()}.tmp"
+    try:
+        with open(temporary, "wb") as f:
+            f.write(data)
+        os.replace(temporary, filename)
+    except OSError:
+        # a read-only boards folder still works, the file is just rebuilt next time
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+# Example usage
+if __name__ == "__main__":
+    board_size: int = 8
+    try:
+        with BoardStore(board_size) as store:
+            print(f"\033[94m{len(store)} boards of size {board_size}, first: {store.get(0) if len(store) else None}\033[0m")
+    except FileNotFoundError:
+        print(f"\033[91mError: File \033[94m{board_filename(board_size)}\033[91m not found.\033[0m")
@@ -7,9 +7,17 @@
 """
 
 import os
-import ast
+import mmap
 import random
 
+try:
+    from boards.board_store import BINARY_HEADER, BINARY_MAGIC, BoardStore, board_filename
+except ImportError:  # run as a script from inside boards/
+    from board_store import BINARY_HEADER, BINARY_MAGIC, BoardStore, board_filename
+
+# one open store for every size, so loading a board is a refresh check and one seek instead of reading the index again
+_stores: dict[int, BoardStore] = {}
+
 def load_board(board_size: int) -> list[list[int]]:
     """
     Load a random board of the specified board_size from the corresponding file.
@@ -19,42 +27,122 @@ def load_board(board_size: int) -> list[list[int]]:
     """
     
     # MARK: Step 1
-    # Get the directory where *this file* is located
-    base_dir = os.path.dirname(__file__)  # <- This will always point to where this file is located
-    
-    # Assuming the file is named "board_<size>.txt"
-    # and located in the same directory as this script
-    filename = os.path.join(base_dir, f"board_{board_size}.txt")
+    # Use the binary file "board_<size>.bin" when the boards were converted, it needs no parsing at all
+    binary = board_filename(board_size, ".bin")
+    if os.path.exists(binary):
+        try:
+            with BinaryBoards(board_size) as boards:
+                if len(boards):
+                    return boards.random_board()
+        except ValueError as e:
+            print(f"\033[91mError: {e}\033[0m")
     
-    # Load all the boards from a file
+    # Otherwise open the indexed store of "board_<size>.txt", located in the same directory as this script
+    filename = board_filename(board_size)
     try:
-        with open(filename, "r") as f:
-            # Read all non-empty lines
-            boards = [line.strip() for line in f if line.strip()]
+        store = _open_store(board_size)
     except FileNotFoundError:
         print(f"\033[91mError: File \033[94m{filename}\033[91m not found.\033[0m")
         return [[0 for _ in range(board_size)] for _ in range(board_size)]
     
     # MARK: Step 2
     # Pick a random board and return a parsed version of it
-    if not boards:
+    if not len(store):
         print(f"\033[91mError: No boards found in \033[94m{filename}\033[91m.\033[0m")
         return [[0 for _ in range(board_size)] for _ in range(board_size)]
     
-    # Choose a random board from the list
-    board = random.choice(boards)
+    # Choose random boards until one of them parses
+    for _ in range(len(store)):
+        try:
+            return store.random_board()
+        except ValueError:
+            print("\033[91mError: Line is not a valid list.\033[0m")
     
-    # Parse the board string into a list
-    try:
-        parsed_list = ast.literal_eval(board)
-    except (ValueError, SyntaxError):
-        print("\033[91mError: Line is not a valid list.\033[0m")
-        parsed_list = load_board(board_size)  # Retry loading a board
-    except Exception as e:
-        print(f"\033[91mUnexpected error: {e}.\033[0m")
-        parsed_list = load_board(board_size)  # Retry loading a board
-    
-    return parsed_list
+    print(f"\033[91mError: No valid boards found in \033[94m{filename}\033[91m.\033[0m")
+    return [[0 for _ in range(board_size)] for _ in range(board_size)]
+
+# MARK: _open_store
+def _open_store(board_size: int) -> BoardStore:
+    """
+    Get the open store of a size, opened on the first call.
+    
+    @param board_size: The size of the boards.
+    @return: The store, refreshed, reopened if board_<size>.txt was replaced by another file.
+    """
+    store: BoardStore | None = _stores.get(board_size)
+    if store is not None:
+        try:
+            if os.stat(store.filename).st_ino == os.fstat(store.file.fileno()).st_ino:
+                store.refresh()
+                return store
+        except FileNotFoundError:
+            pass
+        store.close()
+        del _stores[board_size]
+    
+    store = BoardStore(board_size)  # FileNotFoundError if there are no boards of this size
+    _stores[board_size] = store
+    return store
+
+# MARK: BinaryBoards
+class BinaryBoards:
+    """
+    Memory-mapped reader for binary board files, see board_store.
+    
+    Usage:
+        with BinaryBoards(8) as boards:
+            print(len(boards), boards[0], boards.random_board())
+    """
+    
+    def __init__(self, board_size: int, filename: str | None = None) -> None:
+        self.board_size: int = board_size
+        self.filename  : str = filename or board_filename(board_size, ".bin")
+        self.record    : int = board_size * board_size  # bytes per board
+        
+        self.file = open(self.filename, "rb")
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access = mmap.ACCESS_READ)
+        except ValueError:
+            # an empty file can not be mapped
+            self.file.close()
+            raise ValueError(f"{self.filename} is not a binary board file.")
+        
+        if len(self.data) < BINARY_HEADER.size:
+            self.close()
+            raise ValueError(f"{self.filename} is not a binary board file.")
+        
+        magic, size, self.count = BINARY_HEADER.unpack_from(self.data)
+        if magic != BINARY_MAGIC or size != board_size or len(self.data) < BINARY_HEADER.size + self.count * self.record:
+            self.close()
+            raise ValueError(f"{self.filename} is not a binary board file of size {board_size} or is incomplete.")
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def __getitem__(self, index: int) -> list[list[int]]:
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("board index out of range")
+        start: int = BINARY_HEADER.size + index * self.record
+        cells: bytes = self.data[start : start + self.record]
+        return [list(cells[i : i + self.board_size]) for i in range(0, self.record, self.board_size)]
+    
+    def __enter__(self) -> "BinaryBoards":
+        return self
+    
+    def __exit__(self, *args) -> None:
+        self.close()
+    
+    # MARK: random_board
+    def random_board(self) -> list[list[int]]:
+        return self[random.randrange(self.count)]
+    
+    # MARK: close
+    def close(self) -> None:
+        if hasattr(self, "data"):
+            self.data.close()
+        self.file.close()
 
 
 # Example usage
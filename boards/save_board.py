@@ -9,6 +9,11 @@
 
 import os
 
+try:
+    from boards.board_store import BINARY_HEADER, BINARY_MAGIC, BoardStore, board_filename, parse_board
+except ImportError:  # run as a script from inside boards/
+    from board_store import BINARY_HEADER, BINARY_MAGIC, BoardStore, board_filename, parse_board
+
 def save_board(board_size: int, board: list[list[int]]) -> None:
     """
     Save the board to the correct file, if it is not already in there it creates a new file for it.
@@ -21,68 +26,180 @@ def save_board(board_size: int, board: list[list[int]]) -> None:
     
     # MARK: Step 1
     # Validate the list
+    error = validate_board(board_size, board)
+    if error:
+        print(f"\033[91mError: {error}\033[0m")
+        return
+    
+    # MARK: Step 2
+    # Create/Open the file for the board size
+    store = open_store(board_size)
+    
+    # MARK: Step 3
+    # Save the board to the file, the hash index tells if there is a board same as this one in the file
+    try:
+        with store:
+            if not store.append([board]):
+                print("\033[92mBoard already saved.\033[0m")
+                return
+        # keep the binary file in step with the text file once it has been converted
+        if os.path.exists(board_filename(board_size, ".bin")):
+            save_binary_boards(board_size, [board])
+        print(f"\033[92mBoard({board_size}) saved successfully to {store.filename}.\033[0m")
+    except Exception as e:
+        print(f"\033[91mError: {e}.\033[0m")
+
+# MARK: save_boards
+def save_boards(board_size: int, boards: list[list[list[int]]]) -> int:
+    """
+    Save many boards at once, with one pass over the boards and one write to the file.
+    Invalid boards and boards that are already saved are skipped.
+    
+    @param board_size: The size of the boards to save.
+    @param boards    : The boards to save.
     
+    @return: The number of boards saved.
+    """
+    valid: list[list[list[int]]] = []
+    for number, board in enumerate(boards, 1):
+        error = validate_board(board_size, board)
+        if error:
+            print(f"\033[91mError in board {number}: {error}\033[0m")
+        else:
+            valid.append(board)
+    
+    try:
+        with open_store(board_size) as store:
+            added: list[list[list[int]]] = store.append(valid)
+        if added and os.path.exists(board_filename(board_size, ".bin")):
+            save_binary_boards(board_size, added)
+    except Exception as e:
+        print(f"\033[91mError: {e}.\033[0m")
+        return 0
+    
+    saved: int = len(added)
+    print(f"\033[92m{saved} boards({board_size}) saved to {store.filename}, {len(valid) - saved} already saved.\033[0m")
+    return saved
+
+# MARK: validate_board
+def validate_board(board_size: int, board: list[list[int]]) -> str | None:
+    """
+    Check that a board can be saved.
+    
+    @param board_size: The size of the board.
+    @param board     : The board to check.
+    
+    @return: The error message, None if the board is valid.
+    """
     # make sure it contains board_size number of lists
     if len(board) != board_size:
-        print(f"\033[91mError: Board size mismatch. Expected {board_size} lists, got {len(board)}.\033[0m")
-        return
+        return f"Board size mismatch. Expected {board_size} lists, got {len(board)}."
     
     # make sure each list contains board_size number of integers
     for row in board:
         if len(row) != board_size:
-            print(f"\033[91mError: Each row must contain {board_size} integers.\033[0m")
-            return
+            return f"Each row must contain {board_size} integers."
         
         # make sure each integer is between 1 and board_size
         for num in row:
             if num < 1 or num > board_size:
-                print(f"\033[91mError: Each number must be an integer between 1 and {board_size}.\033[0m")
-                return
+                return f"Each number must be an integer between 1 and {board_size}."
     
-    # Make sure it has all the numbers from 1 to board_size
-    for i in range(1, board_size + 1):
-        if i not in [num for row in board for num in row]:
-            print(f"\033[91mError: Board must be complete.\033[0m")
-            return
+    # Make sure it has all the numbers from 1 to board_size, they are all in range so it is enough to count them
+    if len({num for row in board for num in row}) != board_size:
+        return "Board must be complete."
+    return None
+
+# MARK: save_binary_boards
+def save_binary_boards(board_size: int, boards: list[list[list[int]]], filename: str | None = None) -> int:
+    """
+    Add boards to the end of a binary board file, creating it if it does not exist.
+    The boards are not validated or deduplicated, save_board and save_boards do that before calling this.
     
-    # MARK: Step 2
-    # Create/Open the file for the board size
+    @param board_size: The size of the boards.
+    @param boards    : The boards to add.
+    @param filename  : The binary file, board_<size>.bin next to this script by default.
     
-    # Get the directory where *this file* is located
-    base_dir = os.path.dirname(__file__)  # <- This will always point to where this file is located
+    @return: The number of boards in the file.
+    """
+    if not 1 <= board_size <= 255:
+        raise ValueError(f"Board size must be between 1 and 255, got {board_size}.")
+    filename = filename or board_filename(board_size, ".bin")
     
-    # Assuming the file is named "board_<size>.txt" and located in the same directory as this script
-    filename = os.path.join(base_dir, f"board_{board_size}.txt")
+    # one byte per cell, row by row
+    records: bytes = b"".join(bytes(color for row in board for color in row) for board in boards)
+    
+    if not os.path.exists(filename):
+        with open(filename, "wb") as f:
+            f.write(BINARY_HEADER.pack(BINARY_MAGIC, board_size, len(boards)))
+            f.write(records)
+        return len(boards)
     
-    if os.path.exists(filename):
-        with open(filename, "r") as f:
-            # Read all non-empty lines
-            boards = [line.strip() for line in f if line.strip()]
+    with open(filename, "r+b") as f:
+        magic, size, count = BINARY_HEADER.unpack(f.read(BINARY_HEADER.size))
+        if magic != BINARY_MAGIC or size != board_size:
+            raise ValueError(f"{filename} is not a binary board file of size {board_size}.")
+        
+        # write the records first and the count last, a crash in between only loses the new boards
+        f.seek(BINARY_HEADER.size + count * board_size * board_size)
+        f.write(records)
+        f.truncate()
+        f.seek(0)
+        f.write(BINARY_HEADER.pack(BINARY_MAGIC, board_size, count + len(boards)))
+    return count + len(boards)
+
+# MARK: convert_board_file
+def convert_board_file(board_size: int) -> int:
+    """
+    Write the binary board file of a size from its text file, replacing the binary file if it exists.
+    Lines that are not valid boards are skipped.
+    
+    @param board_size: The size of the boards.
     
-    else:
+    @return: The number of boards converted.
+    """
+    filename = board_filename(board_size, ".bin")
+    boards: list[list[list[int]]] = []
+    with BoardStore(board_size) as store:
+        for board_id in range(len(store)):
+            try:
+                board = parse_board(store.get_line(board_id), board_size)
+            except ValueError:
+                print(f"\033[91mError: Board {board_id} of {store.filename} is not a valid list, skipped.\033[0m")
+                continue
+            
+            error = validate_board(board_size, board)
+            if error:
+                print(f"\033[91mError in board {board_id}: {error}, skipped.\033[0m")
+            else:
+                boards.append(board)
+    
+    temporary: str = f"{filename}.tmp"
+    if os.path.exists(temporary):
+        os.remove(temporary)
+    save_binary_boards(board_size, boards, temporary)
+    os.replace(temporary, filename)
+    print(f"\033[92m{len(boards)} boards({board_size}) converted to {filename}.\033[0m")
+    return len(boards)
+
+# MARK: open_store
+def open_store(board_size: int) -> BoardStore:
+    """
+    Open the store of a board size, creating its file if it does not exist.
+    
+    @param board_size: The size of the boards.
+    
+    @return: The store, to be closed by the caller.
+    """
+    # Assuming the file is named "board_<size>.txt" and located in the same directory as this script
+    filename = board_filename(board_size)
+    
+    if not os.path.exists(filename):
         print(f"\033[91mError: File \033[94m{filename}\033[91m not found.\n\033[92mCreating a new file named: {filename}.\033[0m")
         # Create a new file for the board size
         open(filename, "w").close()
-        boards = []
     
-    # MARK: Step 3
-    # Convert the board to a string format
-    board_str = str(board)
-    
-    # Make sure there is no board same as this one in the file loaded
-    if board_str in boards:
-        print("\033[92mBoard already saved.\033[0m")
-        return
-    
-    # MARK: Step 4
-    # Save the board to the file
-    try:
-        with open(filename, "a") as f:
-            # in append mode write the list to the last empty line
-            f.write(board_str + "\n")
-            print(f"\033[92mBoard({board_size}) saved successfully to {filename}.\033[0m")
-    except Exception as e:
-        print(f"\033[91mError: {e}.\033[0m")
+    return BoardStore(board_size)
 
 # Example usage
 if __name__ == "__main__":
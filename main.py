@@ -1,6 +1,16 @@
 """
     N Queens solver
     
+    The window of the solver. Only the GUI needs pygame, it is imported when a solver is made,
+    so importing this module is fast and works without pygame. The headless engines are in queens/,
+    see python -m queens --help.
+    
+    The counts and the searches of colored boards are kept in the result cache (see queens.cache).
+    
+    Usage:
+        python main.py [--stats FILE] [--no-cache]
+        python -m queens [--no-cache] gui [--stats FILE]
+    
     Made by: NIHAL T P
     GitHub: https://github.com/nihaltp
     LinkedIn: https://www.linkedin.com/in/nihal-tp
@@ -13,22 +23,61 @@ os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
 
 import sys
 import signal
+import colorsys
+import functools
+import contextlib
 
 from boards.load_board import load_board
 from boards.save_board import save_board
+from queens import batch, cache, colored, nqueens, parallel
+from queens.stats import SearchStats
+
+PIECES: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pieces")
+
+pygame = None  # imported by load_pygame when a solver is made
 
-try:
-    import pygame
-except ImportError:
-    print("\033[91mPygame is not installed. Please install it using \033[92m'pip install pygame'\033[0m")
-    sys.exit(1)
-except KeyboardInterrupt:
-    print("Ctrl+C detected! Exiting...")
-    sys.exit(1)
+# MARK: load_pygame
+def load_pygame():
+    """Import pygame on first use, exit with a message if it is not installed."""
+    global pygame
+    if pygame is None:
+        try:
+            import pygame as module
+        except ImportError:
+            print("\033[91mPygame is not installed. Please install it using \033[92m'pip install pygame'\033[0m")
+            sys.exit(1)
+        except KeyboardInterrupt:
+            print("Ctrl+C detected! Exiting...")
+            sys.exit(1)
+        pygame = module
+    return pygame
+
+# MARK: load_sprite
+@functools.lru_cache(maxsize = None)
+def load_sprite(name: str, width: int) -> "pygame.Surface":
+    """
+    Load an image of pieces/ scaled to a square, once for every size.
+    The display mode must be set first, the image is converted to its pixel format.
+    
+    @param name : The file name without .png, e.g. queen_b
+    @param width: The width and height of the sprite.
+    """
+    image = pygame.image.load(os.path.join(PIECES, f"{name}.png")).convert_alpha()
+    return pygame.transform.scale(image, (width, width))
 
 # MARK: solver
 class solver:
-    def __init__(self) -> None:
+    def __init__(self, stats_file: str | None = None, use_cache: bool = True) -> None:
+        """
+        :param stats_file: if given, the counters and phase times of the solver are saved to this JSON file on exit
+        :param use_cache : look up and store the counts and the colored searches in the result cache
+        """
+        self.stats_file: str | None = stats_file
+        self.stats: SearchStats | None = SearchStats() if stats_file else None
+        self.cache: cache.ResultCache | None = cache.default_cache() if use_cache else None
+        
+        load_pygame()
+        
         # Bind the SIGINT (Ctrl+C) to the custom handler
         signal.signal(signal.SIGINT, self._handle_sigint)
         
@@ -61,7 +110,15 @@ class solver:
         self.load_buttons  : tuple[str, ...] = ("New_Board", "Load_Board")
         self.positions     : tuple[tuple[int, int], ...] = ((25, 50), (50 + self.BUTTON_WIDTH, 50))
         
-        self.delay: float = min(0.01, 0.3 * (0.5 ** self.board_size)) * 1000  # delay in milliseconds
+        # Animation: the solver runs self.speed steps per second and the board is drawn self.FPS times per second,
+        # so steps between frames are never drawn. At max speed the solver never waits for a frame.
+        self.FPS            : int   = 60
+        self.speed          : float = 120.0  # solver steps per second
+        self.max_speed      : bool  = False
+        self.step_budget    : float = 0.0    # steps the solver may still take before the next frame
+        self.next_frame_time: int   = 0      # pygame ticks of the next frame at max speed
+        self.clock = pygame.time.Clock()
+        
         self.threats: bool = True  # show threats or not
         
         # Create the Pygame window for Getting Board Size
@@ -72,10 +129,16 @@ class solver:
         pygame.font.init()
         self.FONT = pygame.font.SysFont(None, 28)
         
-        self.BOARD_SIZE_LIMIT: int = 12  # Maximum board size
+        self.BOARD_SIZE_LIMIT     : int = 20  # Maximum board size
+        self.SIMULATION_SIZE_LIMIT: int = 12  # Maximum board size that is simulated, bigger boards are only counted
+        self.COMPLETION_LIMIT     : int = 100     # solutions from a custom board are counted up to this
+        self.COMPLETION_BUDGET    : int = 10_000  # and with at most this many queens placed, so it takes less than a frame
         self.board_size = self.input_num("Size of the board (N x N): ", (self.SQUARE_WIDTH, self.SQUARE_WIDTH), self.BOARD_SIZE_LIMIT)
         
         self.GAME_MODE: str = self.get_mode(self.buttons, self.positions)
+        if self.GAME_MODE == "Simulation" and self.board_size > self.SIMULATION_SIZE_LIMIT:
+            # too big to watch every step, only count the solutions
+            self.GAME_MODE = "Count"
         print(f"\033[92mGame mode selected: {self.GAME_MODE}\033[0m")
         
         self.screen_size = self.SQUARE_WIDTH * self.board_size + 2 * self.SQUARE_WIDTH  # recalculate the screen size based on the new board_size
@@ -85,7 +148,14 @@ class solver:
             # row is the index of the list
             # and the value is the column number
         self.board   : list = [-1 for _ in range(self.board_size)]
-        self.answers : list = []
+        self.solutions_found : int = 0  # solutions are printed as they are found, only the count is kept
+        
+        # what every square of the board looks like on the screen: (row, column) -> (queen, threat)
+        # draw_board only redraws the squares that changed, clear it to redraw the whole board
+        self.drawn_squares : dict[tuple[int, int], tuple[bool, bool]] = {}
+        
+        # pre-rendered boards without any pieces, see board_background and color_board_background
+        self.backgrounds : dict[tuple, pygame.Surface] = {}
         
         # Board positioning
         self.BOARD_X : int = (self.screen_size - self.board_size * self.SQUARE_WIDTH) // 2  # starting x position of the chess board
@@ -96,20 +166,35 @@ class solver:
         self.screen = pygame.display.set_mode((self.screen_size, self.screen_size))
         pygame.display.set_caption(f"{self.board_size} Queens Solver")
         
-        # Load the queen images
-        self.queen_b = pygame.image.load("pieces/queen_b.png").convert_alpha()
-        self.queen_w = pygame.image.load("pieces/queen_w.png").convert_alpha()
-        self.queen_b = pygame.transform.scale(self.queen_b, (self.SQUARE_WIDTH, self.SQUARE_WIDTH))
-        self.queen_w = pygame.transform.scale(self.queen_w, (self.SQUARE_WIDTH, self.SQUARE_WIDTH))
+        # Translucent threat indicator, reused for every threatened square
+        self.threat_overlay = pygame.Surface((self.SQUARE_WIDTH, self.SQUARE_WIDTH), pygame.SRCALPHA)
+        self.threat_overlay.fill(self.SEMI_RED)
         
         self.screen.fill(self.BACKGROUND)  # draw the background
-        self.game()
+        try:
+            self.game()
+        finally:
+            self._save_stats()  # when the game finishes, and when it is quit, as sys.exit in _quit_game passes here
+    
+    # MARK: queen_b
+    @property
+    def queen_b(self) -> "pygame.Surface":
+        """The black queen, loaded when the first queen is drawn."""
+        return load_sprite("queen_b", self.SQUARE_WIDTH)
+    
+    # MARK: queen_w
+    @property
+    def queen_w(self) -> "pygame.Surface":
+        """The white queen, loaded when the first queen is drawn."""
+        return load_sprite("queen_w", self.SQUARE_WIDTH)
     
     # MARK: game
     def game(self) -> None:
         match self.GAME_MODE:
             case "Simulation":
                 self.simulation()
+            case "Count":
+                self.count()
             case "Normal":
                 self.manual()
             case "Colored_New_Board":
@@ -120,108 +205,220 @@ class solver:
     # MARK: simulation
     def simulation(self) -> None:
         print(f"\033[92mStarting the {self.board_size}-Queens solver...\033[0m")
-        col: int = 0
         self.draw_board(self.board)
         
-        while col >= 0:
-            self.board[col] += 1
-            
-            while self.board[col] < self.board_size and not self.is_valid_placement(col):
-                # if the placement is not valid, move the queen to the next column
-                self.board[col] += 1
-                self.draw_board(self.board)
-                self.handle_events()
+        # the headless engine does the search, this only draws every step of it
+        for event, board in nqueens.search(self.board_size, stats = self.stats):
+            self.board = board
             
-            if self.board[col] < self.board_size:
-                # if the queen is within bounds
-                if col == self.board_size - 1:
-                    self.answers.append(self.board.copy())
-                    print(f"\033[92mSolution found \033[94m({len(self.answers)})\033[92m: \033[93m{self.board}\033[0m")
-                    self.draw_board(self.board, show_threats=False)
-                    pygame.time.wait(3 * 1000)  # Pause to show the solution
-                    self.handle_events()
-                else:
-                    col += 1              # Move to the next column
-                    self.board[col] = -1  # Reset the next column
-            else:
-                self.board[col] = -1  # Reset the current column
-                col -= 1              # Backtrack to the previous column
+            if event == "solution":
+                self.solutions_found += 1
+                print(f"\033[92mSolution found \033[94m({self.solutions_found})\033[92m: \033[93m{self.board}\033[0m")
+                self.show_solution(self.board, 3 * 1000)
             
-            self.draw_board(self.board)
+            self.step_done(lambda: self.draw_board(self.board))
+        
+        self.draw_board(self.board)
         
-        print(f"\033[92mAll solutions found \033[94m({len(self.answers)})\033[92m: \033[93m{self.answers}\033[0m")
+        print(f"\033[92mAll solutions found \033[94m({self.solutions_found})\033[0m")
     
-    # MARK: is_valid_placement
-    def is_valid_placement(self, current_col: int) -> bool:
-        """Check if the current queen placement is valid.
+    # MARK: count
+    def count(self) -> None:
+        print(f"\033[92mCounting the solutions of the {self.board_size}-Queens problem...\033[0m")
+        self.draw_text_at_location("Counting the solutions...", self.SQUARE_WIDTH, self.SQUARE_WIDTH * 0.5)
+        pygame.display.flip()
         
-        Returns:
-            bool: True if the placement is valid, False otherwise.
-        """
+        # big boards take long, use every CPU and keep handling the events of the window while the processes count
+        def compute() -> dict:
+            total, unique = parallel.count_symmetric(self.board_size, poll = self.handle_events)
+            return {"total": total, "unique": unique}
         
-        for i in range(current_col):
-            if (self.board[i] == self.board[current_col] or  # Check for column
-                abs(self.board[i] - self.board[current_col]) == abs(i - current_col)):  # Check for diagonal
-                return False
-        return True
+        with self.phase("count"):
+            result: dict = self.cached("nqueens.count_symmetric", self.board_size, compute)
+        total, unique = result["total"], result["unique"]
+        self.solutions_found = total
+        
+        print(f"\033[92mSolutions found \033[94m({total})\033[92m, unique solutions \033[94m({unique})\033[0m")
+        self.clear_text_at_location(self.SQUARE_WIDTH, self.SQUARE_WIDTH * 0.5)
+        self.draw_text_at_location(f"{total} solutions, {unique} unique", self.SQUARE_WIDTH, self.SQUARE_WIDTH * 0.5)
+        pygame.display.flip()
+        pygame.time.wait(3 * 1000)  # Pause to show the count
+        self.handle_events()
     
     # MARK: draw_board
     def draw_board(self, board: list, error_full: bool = False, show_threats: bool = True) -> None:
-        """Draw the sensor values on the screen."""
-        # Draw each square based on sensor value
+        """Draw one frame of the board, only the squares that changed since the last frame are drawn and updated."""
+        full_redraw: bool = not self.drawn_squares
+        changed: list[pygame.Rect] = []
+        threats: list[list[bool]] | None = self.threat_map(board, error_full) if show_threats and self.threats else None
+        background: pygame.Surface = self.board_background()
+        
+        if full_redraw:
+            # one blit for the whole checkerboard, only the squares with something on them are drawn after it
+            self.screen.blit(background, (self.BOARD_X, self.BOARD_Y))
+        
         for row in range(self.board_size):
             for column in range(self.board_size):
-                self.draw_square(row, column, board, error_full, show_threats)
-                pygame.display.flip()
-                pygame.time.delay(int(self.delay))  # Delay for visual effect
+                queen : bool = board[row] == column
+                threat: bool = threats is not None and threats[row][column]
+                
+                previous: tuple[bool, bool] = self.drawn_squares.get((row, column), (False, False))
+                self.drawn_squares[(row, column)] = (queen, threat)
+                if previous == (queen, threat):
+                    continue  # the square already looks like this
+                
+                changed.append(self.draw_square(row, column, queen, threat, background))
+        
+        if full_redraw:
+            pygame.display.flip()  # the background around the board may be new too
+        elif changed:
+            pygame.display.update(changed)
+    
+    # MARK: board_background
+    def board_background(self) -> "pygame.Surface":
+        """Get the empty checkerboard of the current board size, it is only drawn the first time."""
+        key: tuple = ("board", self.board_size)
+        
+        if key not in self.backgrounds:
+            background = pygame.Surface((self.board_size * self.SQUARE_WIDTH, self.board_size * self.SQUARE_WIDTH))
+            for row in range(self.board_size):
+                for column in range(self.board_size):
+                    color: tuple = self.WHITE if ((row + column) % 2) == 0 else self.BLACK
+                    square_rect = pygame.Rect(row * self.SQUARE_WIDTH, column * self.SQUARE_WIDTH, self.SQUARE_WIDTH, self.SQUARE_WIDTH)
+                    pygame.draw.rect(background, color, square_rect)
+            self.backgrounds[key] = background.convert()
+        
+        return self.backgrounds[key]
+    
+    # MARK: color_board_background
+    def color_board_background(self) -> "pygame.Surface":
+        """Get the colored regions of self.color_board without any marks, it is only drawn when the regions change."""
+        key: tuple = ("color", tuple(tuple(row) for row in self.color_board))
+        
+        if key not in self.backgrounds:
+            # the regions are edited by the user, the backgrounds of the old regions are not needed anymore
+            for old_key in [old_key for old_key in self.backgrounds if old_key[0] == "color"]:
+                del self.backgrounds[old_key]
+            
+            background = pygame.Surface((self.board_size * self.SQUARE_WIDTH, self.board_size * self.SQUARE_WIDTH))
+            for row in range(self.board_size):
+                for column in range(self.board_size):
+                    color: tuple = self.colors[self.color_board[row][column]] if self.color_board[row][column] != 0 else self.WHITE
+                    square_rect = pygame.Rect(row * self.SQUARE_WIDTH, column * self.SQUARE_WIDTH, self.SQUARE_WIDTH, self.SQUARE_WIDTH)
+                    pygame.draw.rect(background, color, square_rect)
+            self.backgrounds[key] = background.convert()
+        
+        return self.backgrounds[key]
+    
+    # MARK: step_done
+    def step_done(self, draw) -> None:
+        """
+        Tell the scheduler that the solver took a step, it waits until the next step may run.
+        
+        Frames are drawn at self.FPS, when self.speed is more than self.FPS the steps in between are not drawn.
+        
+        :param draw: function that draws the current state of the board
+        """
+        if self.max_speed:
+            # never wait, only draw when a frame is due
+            if pygame.time.get_ticks() >= self.next_frame_time:
+                with self.phase("render"):
+                    draw()
+                self.handle_events()
+                self.next_frame_time = pygame.time.get_ticks() + 1000 // self.FPS
+            return
+        
+        self.step_budget -= 1
+        if self.step_budget >= 1:
+            return  # skip this frame
+        
+        with self.phase("render"):
+            draw()
+        while self.step_budget < 1 and not self.max_speed:
+            self.handle_events()
+            self.clock.tick(self.FPS)
+            self.step_budget += self.speed / self.FPS
+    
+    # MARK: show_solution
+    def show_solution(self, board: list, duration: int) -> None:
+        """
+        Show a solution without threats for duration milliseconds, while still handling input.
+        Solutions are not shown at max speed.
+        """
+        if self.max_speed:
+            return
+        
+        self.draw_board(board, show_threats=False)
+        end_time: int = pygame.time.get_ticks() + duration
+        while pygame.time.get_ticks() < end_time and not self.max_speed:
+            self.handle_events()
+            self.clock.tick(self.FPS)
     
     # MARK: draw_square
-    def draw_square(self, row: int, column: int, board: list, error_full: bool = False, show_threats: bool = True) -> None:
+    def draw_square(self, row: int, column: int, queen: bool, threat: bool, background: "pygame.Surface") -> "pygame.Rect":
         """Draw individual squares."""
-        color: tuple = self.WHITE if ((row + column) % 2) == 0 else self.BLACK
-        
-        # Draw the square
         square_rect = pygame.Rect(
             self.BOARD_X + row * self.SQUARE_WIDTH,
             self.BOARD_Y + column * self.SQUARE_WIDTH,
             self.SQUARE_WIDTH, self.SQUARE_WIDTH
         )
-        pygame.draw.rect(self.screen, color, square_rect)
         
-        if board[row] == column:
+        # Copy the empty square from the pre-rendered board
+        self.screen.blit(background, square_rect.topleft, square_rect.move(-self.BOARD_X, -self.BOARD_Y))
+        
+        if queen:
             # Draw the queen
             self.screen.blit(self.queen_b if (row + column) % 2 == 0 else self.queen_w, square_rect.topleft)
         
-        if show_threats and self.threats:
-            self.is_under_threat(row, column, square_rect, board, error_full)
+        if threat:
+            self.draw_threat(square_rect)
+        
+        return square_rect
     
-    # MARK: is_under_threat
-    def is_under_threat(self, row: int, column: int, square_rect: pygame.Rect, board: list, error_full: bool = False) -> bool:
-        """Check if the (row, column) is threatened by any existing queen."""
-        i = row  # start from the current row
+    # MARK: threat_map
+    def threat_map(self, board: list, error_full: bool = False) -> list[list[bool]]:
+        """
+        Find every square threatened by an existing queen, for the whole board at once.
+        
+        The queens are counted per column and per diagonal, so each square is a lookup instead of a scan over the queens.
+        Only queens in earlier rows count, unless error_full is True, then all the other rows count.
+        
+        :param board: the board to check
+        :param error_full: check against the entire board
+        :return: threats[row][column] is True if the square is threatened
+        """
+        size: int = self.board_size
+        columns       : list[int] = [0 for _ in range(size)]
+        diagonals     : list[int] = [0 for _ in range(2 * size - 1)]
+        anti_diagonals: list[int] = [0 for _ in range(2 * size - 1)]
+        
+        def add_queen(row: int, amount: int) -> None:
+            column = board[row]
+            if column == -1:
+                return
+            columns[column] += amount
+            diagonals[row - column + size - 1] += amount
+            anti_diagonals[row + column] += amount
         
         if error_full:
-            # Check the entire board
-            i = self.board_size
+            for row in range(size):
+                add_queen(row, 1)
         
-        for r in range(i):
-            col = board[r]
-            if col == -1:
-                continue
-            if r == row and col == column:
-                # Skip the current Queen
-                continue
-            if col == column or abs(col - column) == abs(r - row):
-                self.draw_threat(square_rect)
-                return True
-        return False
+        threats: list[list[bool]] = []
+        for row in range(size):
+            if error_full:
+                add_queen(row, -1)  # the queen of this row does not threaten its own row
+            
+            threats.append([bool(columns[column] or diagonals[row - column + size - 1] or anti_diagonals[row + column])
+                            for column in range(size)])
+            
+            add_queen(row, 1)
+        return threats
     
     # MARK: draw_threat
-    def draw_threat(self, square_rect: pygame.Rect) -> None:
-        # Draw the threat indicator
-        s = pygame.Surface((self.SQUARE_WIDTH, self.SQUARE_WIDTH), pygame.SRCALPHA)
-        s.fill(self.SEMI_RED)
-        self.screen.blit(s, square_rect.topleft)
+    def draw_threat(self, square_rect: "pygame.Rect") -> None:
+        # Draw the threat indicator, the overlay is made once in __init__
+        self.screen.blit(self.threat_overlay, square_rect.topleft)
     
     # MARK: handle_events
     def handle_events(self, events: list["pygame.event.Event"] | None = None) -> None:
@@ -238,11 +435,15 @@ class solver:
                 if (event.key == pygame.K_c and pygame.key.get_mods() & pygame.KMOD_CTRL):
                     self._quit_game(0)
                 elif event.key == pygame.K_UP:
-                    self.delay *= 2
-                    print(f"\033[93mDelay: {self.delay}\033[0m")
+                    self.speed = max(self.speed / 2, 1.0)
+                    print(f"\033[93mSpeed: {self.speed} steps per second\033[0m")
                 elif event.key == pygame.K_DOWN:
-                    self.delay /= 2
-                    print(f"\033[93mDelay: {self.delay}\033[0m")
+                    self.speed *= 2
+                    print(f"\033[93mSpeed: {self.speed} steps per second\033[0m")
+                elif event.key == pygame.K_m:
+                    self.max_speed = not self.max_speed
+                    self.step_budget = 0.0
+                    print(f"\033[93mMax speed: {self.max_speed}\033[0m")
                 elif event.key == pygame.K_t:
                     self.threats = not self.threats
                     print(f"\033[93mShow threats: {self.threats}\033[0m")
@@ -375,6 +576,7 @@ class solver:
         print("\033[96mClick on the board to place/remove queens. Press ENTER to solve.\033[0m")
         while True:
             self.draw_board(self.user_board, error_full=True)
+            self.clock.tick(self.FPS)
             
             events = pygame.event.get()
             self.handle_events(events)
@@ -412,6 +614,7 @@ class solver:
     # MARK: clear_text_at_location
     def clear_text_at_location(self, x: float, y: float) -> None:
         self.screen.fill(self.BACKGROUND, (x, y, self.screen_size, self.screen_size))
+        self.drawn_squares.clear()  # the board was covered, redraw all of it
     
     # MARK: handle_click
     def handle_click(self, pos: tuple):
@@ -429,63 +632,54 @@ class solver:
     
     # MARK: solve_from_partial
     def solve_from_partial(self) -> None:
+        """Tell how many solutions keep the queens of the user, then search for them."""
         print("\033[96mSolving from your custom board...\033[0m")
-        col = 0
-        
-        # go through each coloumn and look for a queen
-        while col < self.board_size and self.user_board[col] != -1:
-            col += 1  # queen is found
-        
-        # if the number of queens found is equal to the board size, add it to the answers and find the next, you dont have to verify this because it is already veryfied in manual using is_valid_manual_board
-        if col == self.board_size:
+        if -1 not in self.user_board:
             print("\033[93mBoard already has a complete solution!\033[0m")
-            self.answers.append(self.user_board.copy())
-            self.draw_board(self.user_board, show_threats=False)
-            pygame.time.wait(1000)  # Pause to show the solution
         
+        # the queens are seeded into the masks, a free row or column without a safe square is found before any search
+        def compute() -> dict:
+            count, exact = nqueens.count_completions_bounded(self.board_size, self.user_board,
+                                                             self.COMPLETION_LIMIT, self.COMPLETION_BUDGET)
+            return {"count": count, "exact": exact}
+        
+        with self.phase("count"):
+            result: dict = self.cached("nqueens.count_completions_bounded",
+                                       [self.board_size, self.user_board, self.COMPLETION_LIMIT, self.COMPLETION_BUDGET], compute)
+        remaining: int = result["count"]
+        if not remaining and result["exact"]:
+            print("\033[91mNo solution has these queens.\033[0m")
+            self.draw_text_at_location("No solution has these queens", self.SQUARE_WIDTH, self.SQUARE_WIDTH * 0.5)
+            pygame.display.flip()
+            pygame.time.wait(3 * 1000)  # Pause to show the message
+            return
+        
+        if not remaining:
+            print("\033[93mSolutions with these queens: too many steps to count them quickly\033[0m")
+        else:
+            more: str = "at least " if not result["exact"] or remaining == self.COMPLETION_LIMIT else ""
+            print(f"\033[92mSolutions with these queens: \033[94m{more}{remaining}\033[0m")
         self.manual_game()
-        print(f"\033[92mAll solutions found \033[94m({len(self.answers)})\033[92m: \033[93m{self.answers}\033[0m")
+        print(f"\033[92mAll solutions found \033[94m({self.solutions_found})\033[0m")
     
     # MARK: manual_game
     def manual_game(self) -> None:
         print(f"\033[92mStarting the manual {self.board_size}-Queens solver...\033[0m")
-        col: int = 0
+        self.board = list(self.user_board)
         self.draw_board(self.board)
         
-        while col >= 0:
-            if self.user_board[col] == -1:
-                # if the user has not placed a queen, place a queen
-                self.board[col] += 1
-            elif self.user_board[col] == self.board[col]:
-                col -= 1  # Backtrack to the previous column
-                continue
-            else:
-                # if the user has placed a queen, set the board to the user board
-                self.board[col] = self.user_board[col]
-                print(f"\033[93mUser placed a queen at ({col}, {self.board[col]})\033[0m")
-            
-            while self.board[col] < self.board_size and not self.is_valid_placement(col):
-                # if the placement is not valid, move the queen to the next column
-                self.board[col] += 1
-                self.draw_board(self.board)
-                self.handle_events()
+        # only the rows without a queen of the user are searched, the queens of the user are never moved
+        for event, board in nqueens.search_partial(self.board_size, self.user_board, self.stats):
+            self.board = board
             
-            if self.board[col] < self.board_size:
-                # if the queen is within bounds
-                if col == self.board_size - 1:
-                    self.answers.append(self.board.copy())
-                    print(f"\033[92mSolution found \033[94m({len(self.answers)})\033[92m: \033[93m{self.board}\033[0m")
-                    self.draw_board(self.board, show_threats=False)
-                    pygame.time.wait(3 * 1000)  # Pause to show the solution
-                    self.handle_events()
-                else:
-                    col += 1              # Move to the next column
-                    self.board[col] = -1  # Reset the next column
-            else:
-                self.board[col] = -1  # Reset the current column
-                col -= 1              # Backtrack to the previous column
+            if event == "solution":
+                self.solutions_found += 1
+                print(f"\033[92mSolution found \033[94m({self.solutions_found})\033[92m: \033[93m{self.board}\033[0m")
+                self.show_solution(self.board, 3 * 1000)
             
-            self.draw_board(self.board)
+            self.step_done(lambda: self.draw_board(self.board))
+        
+        self.draw_board(self.board)
     
     # MARK: colored_game
     def colored_game(self, color_board: bool = True, load: bool = False) -> None:
@@ -512,7 +706,15 @@ class solver:
             6: (255, 192, 203),  # Pink
             7: (0, 128, 128),    # Teal
             8: (128, 128, 128),  # Grey
+            9: (128, 0, 128),    # Purple
+            10: (0, 255, 255),   # Cyan
+            11: (139, 69, 19),   # Brown
+            12: (0, 0, 128),     # Navy
         }
+        # bigger boards get evenly spread hues, the golden ratio keeps the next hue far from the last ones
+        for color in range(len(self.colors) + 1, self.board_size + 1):
+            red, green, blue = colorsys.hsv_to_rgb((color * 0.618034) % 1, 0.55, 0.9)
+            self.colors[color] = (int(red * 255), int(green * 255), int(blue * 255))
         
         """
         Create a 2D list to represent the board.
@@ -526,30 +728,6 @@ class solver:
         """
         self.color_board_state: list[list[str]] = [["" for _ in range(self.board_size)] for _ in range(self.board_size)]
         
-        """
-        Create a list to track the number of colors used.
-        The list will be of size self.board_size.
-        Each index will represent a color, and the value will represent the count of that color used.
-        """
-        self.color_board_count: list[int] = [0 for _ in range(self.board_size)]
-        
-        """
-        Create a list to track the color of queens placed.
-        The length of list will represent the number of queens placed.
-        Each index will represent a queen, and the value will represent the color of that queen.
-        """
-        self.color_board_queens: list[int] = []
-        
-        """
-        Create a list to track single color rows.
-        """
-        self.single_color_rows: list[int] = []
-        
-        """
-        Create a list to track single color columns.
-        """
-        self.single_color_cols: list[int] = []
-        
         # recalculate the screen size based on the new board_size
         self.screen_size = self.SQUARE_WIDTH * self.board_size + 2 * self.SQUARE_WIDTH
         # Create the Pygame window for Colored Queens Solver
@@ -572,6 +750,7 @@ class solver:
         
         while True:
             self.draw_color_board()
+            self.clock.tick(self.FPS)
             
             events = pygame.event.get()
             self.handle_events(events)
@@ -592,12 +771,20 @@ class solver:
     # MARK: draw_color_board
     def draw_color_board(self) -> None:
         """Draw the colored board."""
+        # one blit for all the regions, then only the queens and x marks on top of them
+        self.screen.blit(self.color_board_background(), (self.BOARD_X, self.BOARD_Y))
+        
         for row in range(self.board_size):
             for column in range(self.board_size):
-                color: tuple = self.colors[self.color_board[row][column]] if self.color_board[row][column] != 0 else self.WHITE
-                self.draw_color_square(row, column, color)
-                pygame.display.flip()
-                pygame.time.delay(int(self.delay))  # Delay for visual effect
+                if self.color_board_state[row][column] == "":
+                    continue
+                square_rect = pygame.Rect(
+                    self.BOARD_X + row * self.SQUARE_WIDTH,
+                    self.BOARD_Y + column * self.SQUARE_WIDTH,
+                    self.SQUARE_WIDTH, self.SQUARE_WIDTH
+                )
+                self.mark_color_square(row, column, square_rect)
+        pygame.display.flip()
     
     # MARK: draw_color_square
     def draw_color_square(self, row: int, column: int, color: tuple = (0,0,0), mark: bool = True) -> None:
@@ -622,7 +809,7 @@ class solver:
             pygame.display.flip()
     
     # MARK: mark_color_square
-    def mark_color_square(self, row: int, column: int, square_rect: pygame.Rect) -> None:
+    def mark_color_square(self, row: int, column: int, square_rect: "pygame.Rect") -> None:
         if self.color_board_state[row][column] == "q":
             # draw a queen
             self.screen.blit(self.queen_w, square_rect.topleft)
@@ -686,8 +873,10 @@ class solver:
     def solve_color_board(self):
         """
         1. Reduce the window size
-        2. Check if there is any color with only one cell
-        3. Check if there is any color with only one cell remaining
+        2. Apply the deductions of the rows, columns and colors that changed since they were last checked:
+            a color, row or column with only one cell remaining gets a queen
+            a row/column with only one color remaining removes that color from the other rows/columns
+        3. When there are no deductions left, search for the rest of the solution
         """
         
         # recalculate the screen size based on the new board_size
@@ -699,256 +888,115 @@ class solver:
         self.screen.fill(self.BACKGROUND)  # draw the background
         self.draw_color_board()
         
-        self.count_numbers()
-        self.assign_queens_to_unique_cells()
+        # the free cells as bitmasks, color_board_state only mirrors it for drawing
+        self.color_state: colored.ColoredState = colored.ColoredState(self.color_board, self.stats)
         
         while True:
             self.handle_events()
-            self.mark_singleton_cells()
-            self.check_single_color("row")
-            self.check_single_color("column")
-            self.validate_solution()
-    
-    # MARK: mark_singleton_cells
-    def mark_singleton_cells(self) -> None:
-        """ Check if there are any colors with only one cell remaining """
-        checking: bool = True
-        while checking:
-            recheck : bool = False  # check if we need to check again
-            
-            # check for every color
-            for i in range(self.board_size):
-                # skip the colors with queens
-                if i + 1 in self.color_board_queens:
-                    continue
-                
-                # check how many cells does this colour have
-                cells_available: int = 0
-                first_xy: tuple = ()
-                for x in range(self.board_size):
-                    for y in range(self.board_size):
-                        
-                        # check if the color is threatened
-                        if self.color_board[x][y] == i + 1 and self.color_board_state[x][y] != "x":
-                            cells_available += 1
-                            
-                            # if it is the only available cell so far
-                            if cells_available == 1:
-                                first_xy = x,y
-                
-                # if this color has only one cell, mark it as queen
-                if cells_available == 1:
-                    recheck = True  # check the board once again
-                    x, y = first_xy
-                    self.mark_queen(x, y)
-                    self.draw_color_board()
-                    pygame.time.delay(int(self.delay))  # Delay for visual effect
-                    break  # exit this for-loop and start over
+            with self.phase("deduction"):
+                deduction: tuple[str, int] | None = self.color_state.next_deduction()
             
-            # if all checks are done, end the loop
-            if not recheck:
-                checking = False
-    
-    # MARK: check_single_color
-    def check_single_color(self, axis: str) -> None:
-        """ Check if there are any row/columns with only one color remaining """
-        checking: bool = True
-        while checking:
-            recheck : bool = False
-            
-            for x in range(self.board_size):
-                # skip row/column if it is already checked and marked
-                if x in self.get_single_color(axis):
-                    continue
-                
-                # skip row/col if it has a queen
-                if x in self.color_board_queens:
-                    self.add_single_color(axis, x)
-                    continue
-                
-                # check how many colors does this row/col have
-                colors_set: set = set()
-                
-                for y in range(self.board_size):
-                    
-                    # check if the cell has a queen or is threatened
-                    if self.get_color_board_state(axis, x, y) in ["q", "x"]:
-                        continue
-                    
-                    colors_set.add(self.get_color_board(axis, x, y))
-                
-                if len(colors_set) != 1:
-                    # skip this row/column; more than one color found
-                    continue
-                
-                color = list(colors_set)[0]
-                
-                # mark all instances of the color in other rows as "x"
-                recheck = True
-                self.add_single_color(axis, x)
-                
-                for i in range(self.board_size):
-                    # skip the single color row/col
-                    if i == x:
-                        continue
-                    
-                    if i + 1 in self.color_board_queens:
-                        continue
-                    
-                    for j in range(self.board_size):
-                        if self.get_color_board(axis, i, j) == color and self.get_color_board_state(axis, i, j) not in ["q", "x"]:
-                            self.mark_color_board_state(axis, i, j)
-                            self.draw_custom_color_square(axis, i, j, color)
-                            pygame.display.flip()
-                            pygame.time.delay(int(self.delay))
+            if deduction is None:
+                self.validate_solution()
+                # the deductions are stuck
+                self.search_color_board()
+                continue
             
-            if not recheck:
-                checking = False
-    
-    # MARK: get_single_color
-    def get_single_color(self, axis: str) -> list:
-        """
-        Get the list of single color rows/columns.
-        
-        :param axis: "row" or "column"
-        """
-        return self.single_color_rows if axis == "row" else self.single_color_cols
-    
-    # MARK: add_single_color
-    def add_single_color(self, axis: str, x: int) -> None:
-        """
-        Add the row/column to the list of single color rows/columns.
-        
-        :param axis: "row" or "column"
-        :param x: row/column number
-        """
-        if axis == "row":
-            self.single_color_rows.append(x)
-        elif axis in ["col", "column"]:
-            self.single_color_cols.append(x)
-    
-    # MARK: get_color_board_state
-    def get_color_board_state(self, axis: str, x: int, y: int) -> str:
-        """
-        Get the color board state for a given row/column.
-        
-        :param axis: "row" or "column"
-        :param x: row/column number
-        :param y: row/column number
-        """
-        return self.color_board_state[x][y] if axis == "row" else self.color_board_state[y][x]
+            kind, value = deduction
+            if kind == "queen":
+                self.mark_queen(*divmod(value, self.board_size))
+                self.step_done(self.draw_color_board)
+            elif kind == "x":
+                self.mark_x_cells(value)
+            else:
+                self.validate_solution(dead = True)
     
-    # MARK: get_color_board
-    def get_color_board(self, axis: str, x: int, y: int) -> int:
-        """
-        Get the color board for a given row/column.
+    # MARK: search_color_board
+    def search_color_board(self) -> None:
+        """ Finish the board with the search engine, or go back to editing if the board has no solution. """
+        print("\033[93mNo more deductions, searching for the rest of the solution...\033[0m")
+        with self.phase("search"):
+            result, cached = batch.solve_board(self.color_board, self.cache is not None)
+        solution: list[int] | None = result["solution"]
+        if self.stats is not None and not cached:
+            for name, value in result["stats"].items():
+                self.stats.count(name, value)
+        
+        if solution is None:
+            pygame.time.wait(2 * 1000)  # Pause to show the state
+            print("\033[91mBoard has no solution.\033[0m")
+            self.colored_game(False)
+            return
         
-        :param axis: "row" or "column"
-        :param x: row/column number
-        :param y: row/column number
-        """
-        return self.color_board[x][y] if axis == "row" else self.color_board[y][x]
+        # the deductions only place queens every solution has, so the solution still fits the board
+        for x, y in enumerate(solution):
+            if self.color_board_state[x][y] != "q":
+                self.mark_queen(x, y)
+                self.step_done(self.draw_color_board)
     
-    # MARK: mark_color_board_state
-    def mark_color_board_state(self, axis: str, i: int, j: int) -> None:
+    # MARK: mark_x_cells
+    def mark_x_cells(self, mask: int) -> None:
         """
-        Mark the color board state for a given row/column.
+        Mark the cells of mask as occupied(x), one at a time.
         
-        :param axis: "row" or "column"
-        :param i: row/column number
-        :param j: row/column number
-        """
-        if axis == "row":
-            self.color_board_state[i][j] = "x"
-        elif axis in ["col", "column"]:
-            self.color_board_state[j][i] = "x"
-    
-    # MARK: draw_custom_color_square
-    def draw_custom_color_square(self, axis: str, i: int, j: int, color: int) -> None:
+        :param mask: bitmask of the cells, see colored.ColoredState
         """
-        Draw a custom color square on the board.
+        self.color_state.eliminate(mask)
         
-        :param axis: "row" or "column"
-        :param i: row/column number
-        :param j: row/column number
-        :param color: color number
-        """
-        if axis == "row":
-            self.draw_color_square(i, j, self.colors[color], True)
-        elif axis in ["col", "column"]:
-            self.draw_color_square(j, i, self.colors[color], True)
-    
-    # MARK: assign_queens_to_unique_cells
-    def assign_queens_to_unique_cells(self) -> None:
-        """
-        Assign queens to cells that have only one color.
-        """
-        for i in range(self.board_size):
-            self.handle_events()
-            c: int = self.color_board_count[i]
-            if c == 1:
-                self.place_queen_on_board(i)
-    
-    # MARK: place_queen_on_board
-    def place_queen_on_board(self, i: int) -> None:
-        """
-        if there is a color with only one cell, make it a queen
-        find its position in self.color_board and mark it as a queen
-        """
-        for x in range(self.board_size):
-            for y in range(self.board_size):
-                if self.color_board[x][y] == i + 1:
-                    self.mark_queen(x, y)
-                    self.draw_color_board()
-                    return
+        for x, y in self.color_state.cells(mask):
+            self.color_board_state[x][y] = "x"
+            self.draw_color_square(x, y, self.colors[self.color_board[x][y]], True)
+            self.step_done(pygame.display.flip)
     
     # MARK: mark_queen
     def mark_queen(self, x: int, y: int):
         """
-        Mark the row and coloum as occupied(x)
         Mark self.color_board_state[x][y] as queen(q)
-        Mark the surroundings as occupied(x)
+        Mark the row, column, color and surroundings as occupied(x)
         """
+        free_before: int = self.color_state.free
+        self.color_state.place(x, y)
         
-        self.color_board_queens.append(self.color_board[x][y])
-        
+        for i, j in self.color_state.cells(free_before & ~self.color_state.free):
+            self.color_board_state[i][j] = "x"
         self.color_board_state[x][y] = "q"
-        
-        for i in range(self.board_size):
-            self.color_board_state[x][i] = "x" if self.color_board_state[x][i] != "q" else self.color_board_state[x][i]
-            self.color_board_state[i][y] = "x" if self.color_board_state[i][y] != "q" else self.color_board_state[i][y]
-        
-        for i in [-1, +1]:
-            for j in [-1, +1]:
-                if 0 <= x + i < self.board_size and 0 <= y + j < self.board_size:
-                    self.color_board_state[x + i][y + j] = "x"
-    
-    def count_numbers(self):
-        for row in self.color_board:
-            for num in row:
-                self.color_board_count[num - 1] += 1
     
     # MARK: validate_solution
-    def validate_solution(self) -> None:
-        """ Check if the current queen placement is complete. """
-        if len(self.color_board_queens) == self.board_size:
-            self.answers.append(self.color_board_state)
+    def validate_solution(self, dead: bool = False) -> None:
+        """
+        Check if the current queen placement is complete.
+        
+        :param dead: the deductions already found that the board can not be solved
+        """
+        if self.color_state.solved():
+            self.solutions_found += 1
             pygame.time.wait(3 * 1000)  # Pause to show the solution
             self._quit_game(0)
         
-        else:
-            # check if every square is filled, which means the board is incorrect
-            for row in self.color_board_state:
-                for cell in row:
-                    if cell == "":
-                        # if there is an empty square, it means space for a queen
-                        return
-            
-            # if every square is filled, the board is incorrect
+        # a color, row or column without any space for its queen means the board is incorrect
+        elif dead or self.color_state.dead():
             pygame.time.wait(2 * 1000)  # Pause to show the state
             print("\033[91mBoard is incorrect.\033[0m")
             self.colored_game(False)
     
+    # MARK: cached
+    def cached(self, kind: str, problem: object, compute) -> dict:
+        """
+        Get a result from the result cache, or compute it, see queens.cache.ResultCache.cached
+        
+        :param compute: function that makes the result when it is not in the cache, or when the cache is off
+        """
+        if self.cache is None:
+            return compute()
+        return self.cache.cached(kind, problem, compute)
+    
+    # MARK: phase
+    def phase(self, name: str) -> contextlib.AbstractContextManager:
+        """Time a with block as a phase of the stats, does nothing when the stats are off."""
+        if self.stats is None:
+            return contextlib.nullcontext()
+        return self.stats.phase(name)
+    
     # MARK: take_screenshot
     def take_screenshot(self, base: str = "screenshot", ext: str = ".png", folder: str = "screenshots") -> None:
         """
@@ -984,16 +1032,30 @@ class solver:
     # MARK: _quit_game
     def _quit_game(self, error: int = 0) -> None:
         """Exit the Pygame window."""
-        if hasattr(self, 'answers') and self.answers:
-            print(f"\033[92mSolutions found \033[94m({len(self.answers)})\033[92m: \033[93m{self.answers}\033[0m")
-        elif hasattr(self, 'answers'):
+        if hasattr(self, 'solutions_found') and self.solutions_found:
+            print(f"\033[92mSolutions found \033[94m({self.solutions_found})\033[0m")
+        elif hasattr(self, 'solutions_found'):
             print("\033[91mNo solutions were found.\033[0m")
         print("\033[93mExiting the game...\033[0m")
         pygame.quit()
         if hasattr(self, 'color_board') and self.color_board:
             save_board(self.board_size, self.color_board)
         sys.exit(error)
+    
+    # MARK: _save_stats
+    def _save_stats(self) -> None:
+        """Save the counters and phase times to the stats file, if one was given."""
+        if self.stats is not None:
+            self.stats.dump(self.stats_file)
+            print(f"\033[94mStats saved to {self.stats_file}\033[0m")
 
 
 if __name__ == "__main__":
-    game = solver()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description = "N Queens and Colored Queens solver.")
+    parser.add_argument("--stats", metavar = "FILE", help = "save the search counters and phase times to a JSON file on exit")
+    parser.add_argument("--no-cache", dest = "cache", action = "store_false", help = "do not look up or store results in the result cache")
+    args = parser.parse_args()
+    
+    game = solver(args.stats, args.cache)
@@ -0,0 +1,9 @@
+"""
+    Headless N Queens engines.
+    
+    Nothing in this package imports pygame, so it can be used on machines without a display.
+    
+    Made by: NIHAL T P
+    GitHub: https://github.com/nihaltp
+    LinkedIn: https://www.linkedin.com/in/nihal-tp
+"""
@@ -0,0 +1,253 @@
+"""
+    Command line interface for the headless N Queens engines, and the entry point of the GUI.
+    Only the gui command imports pygame.
+    
+    count, complete --count, solve, solve-file and gui keep their results in the result cache (see queens.cache),
+    --no-cache before the command solves everything again without it.
+    
+    Usage:
+        python -m queens count 14 [--workers 8]
+        python -m queens solutions 10 [--limit 100] [--offset 0] [--workers 8] [--fundamental]
+        python -m queens complete 8 "[-1, -1, 3]" [--count] [--limit 100]
+        python -m queens export 14 solutions_14.nqs [--workers 8]
+        python -m queens read solutions_14.nqs [--limit 100] [--offset 0]
+        python -m queens solve "[[1, 1, 2, 2], ...]" [--stats]
+        python -m queens solve-file boards/board_8.txt [--workers 8]
+        python -m queens convert-boards 8 [9 10 ...]
+        python -m queens generate 8 [--count 100] [--workers 8] [--seed 0] [--no-save]
+        python -m queens gui [--stats FILE]
+    
+    Made by: NIHAL T P
+    GitHub: https://github.com/nihaltp
+    LinkedIn: https://www.linkedin.com/in/nihal-tp
+"""
+
+import os
+import sys
+import ast
+import json
+import argparse
+from itertools import islice
+
+from boards.save_board import convert_board_file, save_boards
+from queens import batch, cache, encoding, generator, nqueens, parallel
+
+# MARK: count
+def count(args: argparse.Namespace) -> None:
+    def compute() -> dict:
+        if args.workers == 1:
+            total, unique = nqueens.count_symmetric(args.board_size)
+        else:
+            total, unique = parallel.count_symmetric(args.board_size, args.workers)
+        return {"total": total, "unique": unique}
+    
+    if args.cache:
+        result: dict = cache.default_cache().cached("nqueens.count_symmetric", args.board_size, compute)
+    else:
+        result = compute()
+    print(f"{result['total']} {result['unique']}")
+
+# MARK: solutions
+def solutions(args: argparse.Namespace) -> None:
+    if args.fundamental:
+        if args.workers == 1:
+            classes = nqueens.fundamental_solutions(args.board_size)
+        else:
+            classes = parallel.fundamental_solutions(args.board_size, args.workers)
+        # the canonical board followed by the number of solutions in its class
+        lines = (f"{board} {multiplicity}" for board, multiplicity in islice(classes, args.offset, None if args.limit is None else args.offset + args.limit))
+    elif args.workers == 1:
+        lines = (str(board) for board in nqueens.solutions(args.board_size, limit = args.limit, offset = args.offset))
+    else:
+        lines = (str(board) for board in parallel.solutions(args.board_size, args.workers, limit = args.limit, offset = args.offset))
+    
+    # one solution per line, written as soon as it is found
+    try:
+        for line in lines:
+            sys.stdout.write(f"{line}\n")
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # the reader stopped early (e.g. piped into head), stop searching quietly
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+
+# MARK: complete
+def complete(args: argparse.Namespace) -> None:
+    try:
+        partial = ast.literal_eval(args.partial)
+    except (ValueError, SyntaxError) as e:
+        print(f"\033[91mError: Invalid board: {e}\033[0m")
+        return
+    if not isinstance(partial, list) or not all(isinstance(col, int) for col in partial):
+        print("\033[91mError: Invalid board: expected a list of columns.\033[0m")
+        return
+    
+    if args.count:
+        def compute() -> dict:
+            return {"count": nqueens.count_completions(args.board_size, partial, args.limit)}
+        
+        if args.cache:
+            result: dict = cache.default_cache().cached("nqueens.count_completions", [args.board_size, partial, args.limit], compute)
+        else:
+            result = compute()
+        print(result["count"])
+        return
+    
+    found = (board.copy() for event, board in nqueens.search_partial(args.board_size, partial) if event == "solution")
+    try:
+        for board in islice(found, args.limit):
+            sys.stdout.write(f"{board}\n")
+        sys.stdout.flush()
+    except BrokenPipeError:
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+
+# MARK: export
+def export(args: argparse.Namespace) -> None:
+    if args.workers == 1:
+        found = nqueens.solutions(args.board_size)
+    else:
+        found = parallel.solutions(args.board_size, args.workers)
+    
+    count: int = encoding.write_solutions(args.filename, args.board_size, found)
+    print(f"\033[92m{count} solutions saved to {args.filename}.\033[0m")
+
+# MARK: read
+def read(args: argparse.Namespace) -> None:
+    with encoding.SolutionFile(args.filename) as found:
+        end: int = len(found) if args.limit is None else min(len(found), args.offset + args.limit)
+        try:
+            for index in range(args.offset, end):
+                sys.stdout.write(f"{found[index]}\n")
+            sys.stdout.flush()
+        except BrokenPipeError:
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, sys.stdout.fileno())
+
+# MARK: solve
+def solve(args: argparse.Namespace) -> None:
+    result: dict = batch.solve_line((1, args.board), args.cache)
+    if "error" in result:
+        print(f"\033[91mError: Invalid board: {result['error']}\033[0m")
+        return
+    
+    if not args.stats:
+        del result["stats"]
+    del result["line"]
+    print(json.dumps(result))
+
+# MARK: solve_file
+def solve_file(args: argparse.Namespace) -> None:
+    # one JSON object per board, in the order of the file
+    try:
+        for result in batch.solve_file(args.filename, args.workers, args.cache):
+            sys.stdout.write(f"{json.dumps(result)}\n")
+            sys.stdout.flush()
+    except BrokenPipeError:
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+
+# MARK: convert_boards
+def convert_boards(args: argparse.Namespace) -> None:
+    for board_size in args.board_sizes:
+        try:
+            convert_board_file(board_size)
+        except FileNotFoundError as e:
+            print(f"\033[91mError: File \033[94m{e.filename}\033[91m not found.\033[0m")
+
+# MARK: generate
+def generate(args: argparse.Namespace) -> None:
+    if args.board_size < 1 or args.board_size in (2, 3):
+        print(f"\033[91mError: There are no colored puzzles of size {args.board_size}.\033[0m")
+        return
+    
+    puzzles = generator.generate(args.board_size, args.count, args.workers, args.seed)
+    if args.no_save:
+        for puzzle in puzzles:
+            sys.stdout.write(f"{puzzle}\n")
+            sys.stdout.flush()
+    else:
+        save_boards(args.board_size, list(puzzles))
+
+# MARK: gui
+def gui(args: argparse.Namespace) -> None:
+    # the window lives in main.py next to this package, it is only imported for this command
+    import main as window
+    window.solver(args.stats, args.cache)
+
+# MARK: main
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog = "python -m queens", description = "Headless N Queens solver.")
+    parser.add_argument("--no-cache", dest = "cache", action = "store_false", help = "do not look up or store results in the result cache")
+    commands = parser.add_subparsers(dest = "command", required = True)
+    
+    count_parser = commands.add_parser("count", help = "print the number of solutions and unique solutions")
+    count_parser.add_argument("board_size", type = int, help = "size of the board (N x N)")
+    count_parser.add_argument("--workers", type = int, default = 1, help = "number of processes, 0 for one per CPU")
+    count_parser.set_defaults(run = count)
+    
+    solutions_parser = commands.add_parser("solutions", help = "stream the solutions, one per line")
+    solutions_parser.add_argument("board_size", type = int, help = "size of the board (N x N)")
+    solutions_parser.add_argument("--limit", type = int, default = None, help = "maximum number of solutions to print")
+    solutions_parser.add_argument("--offset", type = int, default = 0, help = "number of solutions to skip first")
+    solutions_parser.add_argument("--workers", type = int, default = 1, help = "number of processes, 0 for one per CPU")
+    solutions_parser.add_argument("--fundamental", action = "store_true", help = "only one solution of every rotation/reflection class, followed by the size of its class")
+    solutions_parser.set_defaults(run = solutions)
+    
+    complete_parser = commands.add_parser("complete", help = "stream the solutions that keep the queens of a partial board, one per line")
+    complete_parser.add_argument("board_size", type = int, help = "size of the board (N x N)")
+    complete_parser.add_argument("partial", help = "column of the queen in every row, -1 for a free row, e.g. \"[-1, -1, 3]\"")
+    complete_parser.add_argument("--count", action = "store_true", help = "only print the number of solutions")
+    complete_parser.add_argument("--limit", type = int, default = None, help = "maximum number of solutions to print or count")
+    complete_parser.set_defaults(run = complete)
+    
+    export_parser = commands.add_parser("export", help = "save the solutions to a binary solution file")
+    export_parser.add_argument("board_size", type = int, help = "size of the board (N x N)")
+    export_parser.add_argument("filename", help = "file to write")
+    export_parser.add_argument("--workers", type = int, default = 1, help = "number of processes, 0 for one per CPU")
+    export_parser.set_defaults(run = export)
+    
+    read_parser = commands.add_parser("read", help = "print the solutions of a binary solution file, one per line")
+    read_parser.add_argument("filename", help = "file to read")
+    read_parser.add_argument("--limit", type = int, default = None, help = "maximum number of solutions to print")
+    read_parser.add_argument("--offset", type = int, default = 0, help = "number of solutions to skip first")
+    read_parser.set_defaults(run = read)
+    
+    solve_parser = commands.add_parser("solve", help = "solve one colored board and print the result as JSON")
+    solve_parser.add_argument("board", help = "the board as a Python list, e.g. \"[[1, 1, 2, 2], ...]\"")
+    solve_parser.add_argument("--stats", action = "store_true", help = "add the counters of the search to the result")
+    solve_parser.set_defaults(run = solve)
+    
+    solve_file_parser = commands.add_parser("solve-file", help = "solve every colored board of a board file, one JSON line per board")
+    solve_file_parser.add_argument("filename", help = "board file, one board per line")
+    solve_file_parser.add_argument("--workers", type = int, default = 1, help = "number of processes, 0 for one per CPU")
+    solve_file_parser.set_defaults(run = solve_file)
+    
+    convert_parser = commands.add_parser("convert-boards", help = "convert boards/board_<size>.txt files to the binary board format")
+    convert_parser.add_argument("board_sizes", type = int, nargs = "+", help = "sizes of the board files to convert")
+    convert_parser.set_defaults(run = convert_boards)
+    
+    generate_parser = commands.add_parser("generate", help = "generate colored puzzles with exactly one solution and save them to boards/")
+    generate_parser.add_argument("board_size", type = int, help = "size of the board (N x N)")
+    generate_parser.add_argument("--count", type = int, default = 1, help = "number of puzzles")
+    generate_parser.add_argument("--workers", type = int, default = 1, help = "number of processes, 0 for one per CPU")
+    generate_parser.add_argument("--seed", type = int, default = 0, help = "puzzle i is made from seed + i")
+    generate_parser.add_argument("--no-save", action = "store_true", help = "print the puzzles, one per line, instead of saving them")
+    generate_parser.set_defaults(run = generate)
+    
+    gui_parser = commands.add_parser("gui", help = "open the solver window (needs pygame)")
+    gui_parser.add_argument("--stats", metavar = "FILE", help = "save the search counters and phase times to a JSON file on exit")
+    gui_parser.set_defaults(run = gui)
+    
+    args = parser.parse_args(argv)
+    if getattr(args, "workers", 1) == 0:
+        args.workers = None  # let the process pool use every CPU
+    args.run(args)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\033[93mCtrl+C detected! Exiting...\033[0m")
+        sys.exit(1)
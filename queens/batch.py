@@ -0,0 +1,106 @@
+"""
+    Batch solver for files of colored boards.
+    
+    A board file has one board per line, written as a Python list like the files in boards/.
+    Every board is solved on its own, so the boards are spread over a process pool and the
+    results come back in the order of the file. Solved boards are kept in the result cache
+    (see queens.cache), a board seen before is not solved again.
+    
+    Made by: NIHAL T P
+    GitHub: https://github.com/nihaltp
+    LinkedIn: https://www.linkedin.com/in/nihal-tp
+"""
+
+import ast
+import time
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+
+from queens import cache, colored
+from queens.stats import SearchStats
+
+RESULT_FIELDS: tuple[str, ...] = ("solution", "nodes", "stats")  # the fields of a "colored.solve" result
+
+# MARK: read_boards
+def read_boards(filename: str) -> list[tuple[int, str]]:
+    """
+    Read the non-empty lines of a board file.
+    
+    @param filename: The board file.
+    @return: A list of (line number, line), line numbers start at 1.
+    """
+    with open(filename, "r") as f:
+        return [(number, line.strip()) for number, line in enumerate(f, 1) if line.strip()]
+
+# MARK: solve_file
+def solve_file(filename: str, workers: int | None = None, use_cache: bool = True) -> Iterator[dict]:
+    """
+    Solve every board of a board file.
+    
+    @param filename : The board file.
+    @param workers  : Number of processes, the number of CPUs by default, 1 solves in this process.
+    @param use_cache: Look up and store the results in the result cache.
+    @return: An iterator of results, in the order of the file, see solve_line.
+    """
+    lines: list[tuple[int, str]] = read_boards(filename)
+    solve = functools.partial(solve_line, use_cache = use_cache)
+    if workers == 1:
+        yield from map(solve, lines)
+        return
+    
+    with ProcessPoolExecutor(max_workers = workers) as executor:
+        yield from executor.map(solve, lines, chunksize = 16)
+
+# MARK: solve_line
+def solve_line(line: tuple[int, str], use_cache: bool = True) -> dict:
+    """
+    Solve the board on one line of a board file.
+    
+    @param line     : (line number, line)
+    @param use_cache: Look up and store the result in the result cache.
+    @return: {"line", "size", "solution", "time", "nodes", "stats", "cached"}, the solution is None when the board
+             has no solution, stats has all the counters of the search (see queens.stats), nodes and stats are the
+             ones of the first solve when the result came from the cache.
+             {"line", "error"} when the line is not a valid board.
+    """
+    number, text = line
+    try:
+        board = ast.literal_eval(text)
+        start: float = time.perf_counter()
+        result, cached = solve_board(board, use_cache)
+        elapsed: float = time.perf_counter() - start
+    except (ValueError, TypeError, SyntaxError) as e:
+        return {"line": number, "error": str(e)}
+    
+    return {"line": number, "size": len(board), "solution": result["solution"], "time": round(elapsed, 6),
+            "nodes": result["nodes"], "stats": result["stats"], "cached": cached}
+
+# MARK: solve_board
+def solve_board(board: list[list[int]], use_cache: bool = True) -> tuple[dict, bool]:
+    """
+    Solve a colored board through the result cache, every user of the "colored.solve" results goes through here
+    so they all store the same fields.
+    
+    @param board    : The color board.
+    @param use_cache: Look up and store the result in the result cache.
+    @return: ({"solution", "nodes", "stats"}, True if the result came from the cache).
+             A cached result without all of these fields is solved again.
+    """
+    result: dict | None = cache.default_cache().get("colored.solve", board) if use_cache else None
+    if result is not None and all(field in result for field in RESULT_FIELDS):
+        return result, True
+    
+    stats = SearchStats()
+    result = {"solution": colored.solve(board, stats), "nodes": stats["nodes"], "stats": dict(sorted(stats.items()))}
+    if use_cache:
+        cache.default_cache().put("colored.solve", board, result)
+    return result, False
+
+# Example usage
+if __name__ == "__main__":
+    import os
+    
+    filename: str = os.path.join(os.path.dirname(__file__), "..", "boards", "board_8.txt")
+    for result in solve_file(filename, 1):
+        print(f"\033[94m{result}\033[0m")
@@ -0,0 +1,223 @@
+"""
+    Persistent cache of solve results.
+    
+    A result is stored under the digest of its problem (the kind of query and its input, e.g.
+    ("colored.solve", board)), so the same board or size is only solved once, across runs and processes.
+    
+    Every result is a small JSON file <folder>/<first 2 hex digits>/<digest>.json, written to a temporary
+    file and renamed, so worker processes can share the folder without locks. The files are kept under
+    max_bytes by removing the least recently used ones: a hit touches the mtime of its file, and when the
+    folder grows past max_bytes the oldest files are removed until it is back under 90% of it.
+    The last results are also kept in memory, a hit on those does not touch the disk at all.
+    
+    The folder is $QUEENS_CACHE_DIR, or queens in $XDG_CACHE_HOME (~/.cache by default).
+    
+    Made by: NIHAL T P
+    GitHub: https://github.com/nihaltp
+    LinkedIn: https://www.linkedin.com/in/nihal-tp
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+import functools
+from collections import OrderedDict
+from typing import Callable
+
+VERSION          : int = 1  # part of every key, change it when the results of an engine change
+DEFAULT_MAX_BYTES: int = 64 * 1024 * 1024
+
+# MARK: default_folder
+def default_folder() -> str:
+    if os.environ.get("QUEENS_CACHE_DIR"):
+        return os.environ["QUEENS_CACHE_DIR"]
+    base: str = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "queens")
+
+# MARK: default_cache
+@functools.lru_cache(maxsize = None)
+def default_cache() -> "ResultCache":
+    """The cache in the default folder, one for every process."""
+    return ResultCache()
+
+# MARK: problem_key
+def problem_key(kind: str, problem: object) -> str:
+    """
+    Get the digest a problem is stored under.
+    
+    @param kind   : The query, e.g. "colored.solve".
+    @param problem: Its input, anything json can write, e.g. a board or a size.
+    @return: 32 hex digits.
+    """
+    text: str = json.dumps([VERSION, kind, problem], separators = (",", ":"))
+    return hashlib.blake2b(text.encode(), digest_size = 16).hexdigest()
+
+# MARK: ResultCache
+class ResultCache:
+    """
+    Usage:
+        cache = ResultCache()
+        result = cache.cached("colored.solve", board, lambda: {"solution": colored.solve(board)})
+    """
+    
+    def __init__(self, folder: str | None = None, max_bytes: int = DEFAULT_MAX_BYTES, memory_entries: int = 1024) -> None:
+        """
+        @param folder        : The folder of the result files, default_folder() by default.
+        @param max_bytes     : The size the result files are kept under.
+        @param memory_entries: The number of results also kept in memory.
+        """
+        self.folder        : str = folder or default_folder()
+        self.max_bytes     : int = max_bytes
+        self.memory_entries: int = memory_entries
+        self.memory        : OrderedDict[str, dict] = OrderedDict()  # key -> result, the last used at the end
+        self.size          : int | None = None  # bytes of the result files, counted on the first write
+    
+    # MARK: get
+    def get(self, kind: str, problem: object) -> dict | None:
+        """
+        Look up a result.
+        
+        @param kind   : The query, e.g. "colored.solve".
+        @param problem: Its input.
+        @return: The stored result, None if it is not in the cache.
+        """
+        key: str = problem_key(kind, problem)
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            return self.memory[key]
+        
+        path: str = self._path(key)
+        try:
+            with open(path, "r") as f:
+                result: dict = json.load(f)
+            os.utime(path)  # the file was used, it is removed last
+        except (OSError, ValueError):
+            return None
+        
+        self._remember(key, result)
+        return result
+    
+    # MARK: put
+    def put(self, kind: str, problem: object, result: dict) -> None:
+        """
+        Store a result, failing to write it only costs solving it again later.
+        
+        @param kind   : The query, e.g. "colored.solve".
+        @param problem: Its input.
+        @param result : The result, anything json can write.
+        """
+        key: str = problem_key(kind, problem)
+        self._remember(key, result)
+        
+        path: str = self._path(key)
+        data: bytes = json.dumps(result, separators = (",", ":")).encode()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok = True)
+            fd, temporary = tempfile.mkstemp(dir = os.path.dirname(path), suffix = ".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            try:
+                replaced: int = os.path.getsize(path)  # a result stored again only changes the size by the difference
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(temporary, path)
+        except OSError:
+            return
+        
+        if self.size is None:
+            self.size = sum(size for _, size, _ in self._files())
+        else:
+            self.size += len(data) - replaced
+        if self.size > self.max_bytes:
+            self._evict()
+    
+    # MARK: cached
+    def cached(self, kind: str, problem: object, compute: Callable[[], dict]) -> dict:
+        """
+        Get a result from the cache, or compute and store it.
+        
+        @param kind   : The query, e.g. "colored.solve".
+        @param problem: Its input.
+        @param compute: Makes the result when it is not in the cache.
+        @return: The result.
+        """
+        result: dict | None = self.get(kind, problem)
+        if result is None:
+            result = compute()
+            self.put(kind, problem, result)
+        return result
+    
+    # MARK: clear
+    def clear(self) -> None:
+        """Remove every result."""
+        self.memory.clear()
+        for path, _, _ in self._files():
+            _remove(path)
+        self.size = 0
+    
+    # MARK: _remember
+    def _remember(self, key: str, result: dict) -> None:
+        self.memory[key] = result
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_entries:
+            self.memory.popitem(last = False)
+    
+    # MARK: _path
+    def _path(self, key: str) -> str:
+        return os.path.join(self.folder, key[:2], f"{key}.json")
+    
+    # MARK: _files
+    def _files(self) -> list[tuple[str, int, float]]:
+        """Get (path, size, mtime) of every result file."""
+        files: list[tuple[str, int, float]] = []
+        if not os.path.isdir(self.folder):
+            return files
+        for entry in os.scandir(self.folder):
+            if not entry.is_dir():
+                continue
+            for file in os.scandir(entry.path):
+                if file.name.endswith(".json"):
+                    try:
+                        stat = file.stat()
+                    except OSError:
+                        continue  # removed by another process
+                    files.append((file.path, stat.st_size, stat.st_mtime))
+        return files
+    
+    # MARK: _evict
+    def _evict(self) -> None:
+        """Remove the least recently used files until the folder is under 90% of max_bytes."""
+        files: list[tuple[str, int, float]] = sorted(self._files(), key = lambda file: file[2])
+        self.size = sum(size for _, size, _ in files)
+        target: int = self.max_bytes * 9 // 10
+        for path, size, _ in files:
+            if self.size <= target:
+                break
+            _remove(path)
+            self.size -= size
+            self.memory.pop(os.path.basename(path)[:-len(".json")], None)
+
+# MARK: _remove
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass  # removed by another process
+
+
+# Example usage
+if __name__ == "__main__":
+    import time
+    from queens import nqueens
+    
+    cache = ResultCache(tempfile.mkdtemp())
+    for _ in range(2):
+        start: float = time.perf_counter()
+        result: dict = cache.cached("nqueens.count_symmetric", 10, lambda: dict(zip(("total", "unique"), nqueens.count_symmetric(10))))
+        print(f"\033[94m{result} in {(time.perf_counter() - start) * 1e6:.0f} µs\033[0m")
+    
+    cache.memory.clear()  # the next hit reads the file
+    start = time.perf_counter()
+    cache.get("nqueens.count_symmetric", 10)
+    print(f"\033[94mFrom disk in {(time.perf_counter() - start) * 1e6:.0f} µs\033[0m")
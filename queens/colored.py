@@ -0,0 +1,449 @@
+"""
+    Colored Queens (LinkedIn Queens) engine.
+    
+    Every row, every column and every color region gets exactly one queen, and no two queens may touch,
+    not even diagonally.
+    
+    The search places the queens that are forced by the deduction rules (single cells, cells attacked by
+    every candidate of a row, column or color, and K colors confined to K rows or columns), then tries every
+    free cell of the region with the fewest free cells left and backtracks when a region, row or column runs
+    out of cells.
+    It always ends, with a solution or with None when the board has no solution.
+    
+    A solution is a list where the index is the row and the value is the column of the queen in that row.
+    
+    Made by: NIHAL T P
+    GitHub: https://github.com/nihaltp
+    LinkedIn: https://www.linkedin.com/in/nihal-tp
+"""
+
+from typing import Iterator
+
+# MARK: solve
+def solve(color_board: list[list[int]], stats: dict[str, int] | None = None) -> list[int] | None:
+    """
+    Solve a colored board.
+    
+    @param color_board: board_size lists of board_size colors, numbered from 1 to board_size.
+    @param stats      : If given, the search is counted in it, see queens.stats.
+    @return: The solution, None if the board has no solution.
+    """
+    return next(solutions(color_board, stats), None)
+
+# MARK: count_solutions
+def count_solutions(color_board: list[list[int]], limit: int | None = None, stats: dict[str, int] | None = None) -> int:
+    """
+    Count the solutions of a colored board.
+    
+    @param color_board: board_size lists of board_size colors, numbered from 1 to board_size.
+    @param limit      : Stop counting at this many solutions, 2 is enough to know if the solution is unique.
+    @param stats      : If given, the search is counted in it, see queens.stats.
+    @return: The number of solutions, at most limit.
+    """
+    found: int = 0
+    for _ in solutions(color_board, stats):
+        found += 1
+        if limit is not None and found >= limit:
+            break
+    return found
+
+# MARK: solutions
+def solutions(color_board: list[list[int]], stats: dict[str, int] | None = None) -> Iterator[list[int]]:
+    """
+    Yield every solution of a colored board.
+    
+    @param color_board: board_size lists of board_size colors, numbered from 1 to board_size.
+    @param stats      : If given, the search is counted in it as it goes, see queens.stats.
+    @return: An iterator of solutions.
+    """
+    if stats is not None:
+        for name in ("nodes", "backtracks", "solutions"):
+            stats.setdefault(name, 0)
+    
+    state = ColoredState(color_board, stats)
+    if state.propagate():
+        yield from _search(state, stats)
+
+# MARK: _search
+def _search(state: "ColoredState", stats: dict | None) -> Iterator[list[int]]:
+    if stats is not None:
+        stats["nodes"] += 1
+    if state.solved():
+        if stats is not None:
+            stats["solutions"] += 1
+        yield state.solution()
+        return
+    
+    # branch on the region with the fewest free cells, it has the fewest choices to get wrong
+    color: int = min(state.open_regions(), key = lambda color: state.region_free(color).bit_count())
+    for x, y in state.region_cells(color):
+        child = state.copy()
+        if child.place(x, y) and child.propagate():
+            yield from _search(child, stats)
+        elif stats is not None:
+            stats["backtracks"] += 1
+
+# MARK: ColoredState
+class ColoredState:
+    """
+    The cells where a queen can still go, and the queens placed so far.
+    
+    Cell (x, y) is bit x * board_size + y. All the free cells are one integer bitmask, and every row, column,
+    color and the cells attacked from every cell are precomputed masks, so a count is a popcount and
+    removing cells is an AND.
+    
+    Rows, columns and colors are "units": unit x is row x, unit board_size + y is column y and
+    unit 2 * board_size + color - 1 is a color. When cells are removed only the units they belong to are
+    queued to be checked again, so the work after a change is proportional to the change.
+    """
+    
+    def __init__(self, color_board: list[list[int]], stats: dict | None = None) -> None:
+        self.size: int = len(color_board)
+        if any(len(row) != self.size for row in color_board):
+            raise ValueError(f"Each row must contain {self.size} colors.")
+        if {color for row in color_board for color in row} != set(range(1, self.size + 1)):
+            raise ValueError(f"Every color from 1 to {self.size} must be used, and no other.")
+        
+        self.color_board: list[list[int]] = color_board
+        self.layout     : _Layout = _Layout(color_board)
+        self.free       : int = (1 << (self.size * self.size)) - 1
+        self.queens     : dict[int, tuple[int, int]] = {}  # color -> cell of its queen
+        self.taken      : int = 0  # bit unit is set when the unit has a queen
+        
+        # units to check again, every unit starts dirty
+        self.queue   : list[int] = list(range(3 * self.size - 1, -1, -1))
+        self.queued  : int = (1 << (3 * self.size)) - 1
+        self.confined: int = -1  # free cells when the confinement rules last found nothing
+        self.stats   : dict | None = stats  # counters of the rules, shared by the copies, see queens.stats
+    
+    # MARK: copy
+    def copy(self) -> "ColoredState":
+        other = ColoredState.__new__(ColoredState)
+        other.size        = self.size
+        other.color_board = self.color_board
+        other.layout      = self.layout
+        other.free        = self.free
+        other.queens      = dict(self.queens)
+        other.taken       = self.taken
+        other.queue       = list(self.queue)
+        other.queued      = self.queued
+        other.confined    = self.confined
+        other.stats       = self.stats
+        return other
+    
+    # MARK: solved
+    def solved(self) -> bool:
+        return len(self.queens) == self.size
+    
+    # MARK: solution
+    def solution(self) -> list[int]:
+        board: list[int] = [-1 for _ in range(self.size)]
+        for x, y in self.queens.values():
+            board[x] = y
+        return board
+    
+    # MARK: open_regions
+    def open_regions(self) -> list[int]:
+        """Get the colors that do not have a queen yet."""
+        return [color for color in range(1, self.size + 1) if color not in self.queens]
+    
+    # MARK: region_free
+    def region_free(self, color: int) -> int:
+        """Get the free cells of a color as a bitmask."""
+        return self.free & self.layout.regions[color]
+    
+    # MARK: region_cells
+    def region_cells(self, color: int) -> list[tuple[int, int]]:
+        """Get the free cells of a color."""
+        return self.cells(self.region_free(color))
+    
+    # MARK: cells
+    def cells(self, mask: int) -> list[tuple[int, int]]:
+        """Turn a bitmask into a list of (x, y) cells."""
+        found: list[tuple[int, int]] = []
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            found.append(divmod(bit.bit_length() - 1, self.size))
+        return found
+    
+    # MARK: place
+    def place(self, x: int, y: int) -> bool:
+        """
+        Place a queen and remove every cell it attacks: its row, its column, its color and the cells touching it.
+        
+        @return: False if the cell is not free.
+        """
+        cell: int = x * self.size + y
+        if not (self.free >> cell) & 1:
+            return False
+        
+        self.queens[self.color_board[x][y]] = (x, y)
+        for unit in self.layout.cell_units[cell]:
+            self.taken |= 1 << unit
+        self.eliminate(self.layout.attacks[cell])
+        return True
+    
+    # MARK: eliminate
+    def eliminate(self, mask: int) -> None:
+        """Remove the cells of mask, no queen can go there, and queue the units they belong to."""
+        removed: int = self.free & mask
+        self.free &= ~mask
+        
+        cell_units = self.layout.cell_units
+        while removed:
+            bit = removed & -removed
+            removed ^= bit
+            for unit in cell_units[bit.bit_length() - 1]:
+                if not (self.queued >> unit) & 1:
+                    self.queued |= 1 << unit
+                    self.queue.append(unit)
+    
+    # MARK: dead
+    def dead(self) -> bool:
+        """Check if a color, row or column without a queen has no free cells left."""
+        for unit, mask in enumerate(self.layout.units):
+            if not (self.taken >> unit) & 1 and not self.free & mask:
+                return True
+        return False
+    
+    # MARK: next_deduction
+    def next_deduction(self) -> tuple[str, int] | None:
+        """
+        Check the queued units until one of them gives a deduction:
+            ("dead", unit)   : a unit without a queen has no free cells left, the board can not be solved from here
+            ("queen", cell)  : a unit has one free cell left, its queen goes there
+            ("x", mask)      : cells attacked by every free cell of a unit, whichever one gets the queen
+        
+        When the queue is empty the confinement rules are checked, see _confinement.
+        The deduction is not applied, the caller applies it with place or eliminate.
+        
+        @return: The deduction, None when there is none left.
+        """
+        layout = self.layout
+        attacks = layout.attacks
+        stats = self.stats
+        while self.queue:
+            unit: int = self.queue.pop()
+            self.queued &= ~(1 << unit)
+            if (self.taken >> unit) & 1:
+                continue
+            if stats is not None:
+                stats["units_checked"] = stats.get("units_checked", 0) + 1
+            
+            mask: int = self.free & layout.units[unit]
+            if not mask:
+                return self._found("dead", ("dead", unit))
+            if not mask & (mask - 1):
+                return self._found("rule.single_cell", ("queen", mask.bit_length() - 1))
+            
+            # the queen of the unit is on one of its free cells, so a cell all of them attack can not have a queen.
+            # this also covers a row/column with one color left and a color confined to one row/column
+            common: int = self.free & ~layout.units[unit]
+            while mask and common:
+                bit = mask & -mask
+                mask ^= bit
+                common &= attacks[bit.bit_length() - 1]
+            if common:
+                return self._found("rule.attacks", ("x", common))
+        
+        if self.free == self.confined:
+            return None
+        if stats is not None:
+            stats["confinement_passes"] = stats.get("confinement_passes", 0) + 1
+        for name, axis in (("rows", layout.rows), ("cols", layout.cols)):
+            deduction = self._confinement(axis)
+            if deduction is not None:
+                return self._found("dead" if deduction[0] == "dead" else f"rule.confinement_{name}", deduction)
+        self.confined = self.free
+        return None
+    
+    # MARK: _found
+    def _found(self, name: str, deduction: tuple[str, int]) -> tuple[str, int]:
+        """Count a deduction in the stats, if there are any, and return it."""
+        if self.stats is not None:
+            self.stats[name] = self.stats.get(name, 0) + 1
+        return deduction
+    
+    # MARK: _confinement
+    def _confinement(self, lines: list[int]) -> tuple[str, int] | None:
+        """
+        Pigeonhole rules between the colors and a set of K rows (or columns) without a queen:
+            K colors confined to the K rows  : the other colors can not use those rows
+            K rows that only have K colors   : those colors can not be used outside the K rows
+            more than K colors confined to K rows, or fewer than K colors in K rows : the board is dead
+        
+        The sets checked are every run of consecutive lines and the lines used by every color.
+        
+        @param lines: layout.rows or layout.cols
+        @return: A deduction like next_deduction, None if there is none.
+        """
+        # bit color of present[i] is set when the color has a free cell on line i
+        regions: list[tuple[int, int]] = [(1 << color, self.region_free(color)) for color in self.open_regions()]
+        present: list[int] = []
+        for line in lines:
+            colors: int = 0
+            free_line: int = self.free & line
+            if free_line:
+                for bit, region in regions:
+                    if region & free_line:
+                        colors |= bit
+            present.append(colors)
+        
+        open_lines: int = 0
+        for i, colors in enumerate(present):
+            if colors:
+                open_lines |= 1 << i
+        
+        # colors present on lines before i and from i on
+        before: list[int] = [0]
+        for colors in present:
+            before.append(before[-1] | colors)
+        after: list[int] = [0]
+        for colors in reversed(present):
+            after.append(after[-1] | colors)
+        after.reverse()
+        
+        # every run of consecutive lines, starting and ending on a line with free cells
+        for start in range(self.size):
+            if not present[start]:
+                continue
+            touching: int = 0
+            for end in range(start, self.size):
+                touching |= present[end]
+                if present[end]:
+                    group: int = (1 << (end + 1)) - (1 << start)
+                    deduction = self._check_group(lines, group & open_lines, touching, before[start] | after[end + 1])
+                    if deduction is not None:
+                        return deduction
+        
+        # the lines used by every color
+        for bit, _ in regions:
+            group = 0
+            touching = 0
+            for i, colors in enumerate(present):
+                if colors & bit:
+                    group |= 1 << i
+                    touching |= colors
+            deduction = self._check_group(lines, group, touching, self._lines_colors(present, open_lines & ~group))
+            if deduction is not None:
+                return deduction
+        return None
+    
+    # MARK: _check_group
+    def _check_group(self, lines: list[int], group: int, touching: int, outside: int) -> tuple[str, int] | None:
+        """
+        Apply the confinement rules to one group of lines.
+        
+        @param lines   : layout.rows or layout.cols
+        @param group   : Bit i is set for every line i of the group, all of them with free cells.
+        @param touching: Bit color is set for every color with free cells on the group.
+        @param outside : Bit color is set for every color with free cells on the other lines.
+        @return: A deduction like next_deduction, None if there is none.
+        """
+        if not outside:
+            return None  # all the open lines, every open color is confined to them
+        
+        k: int = group.bit_count()
+        inside: int = touching & ~outside
+        inside_count: int = inside.bit_count()
+        touching_count: int = touching.bit_count()
+        if inside_count > k or touching_count < k:
+            return "dead", -1
+        
+        # the rules only remove cells when another color is on the group, or a touching color is outside it
+        if not (inside_count == k and touching != inside) and not (touching_count == k and touching & outside):
+            return None
+        
+        group_cells: int = 0
+        for i, line in enumerate(lines):
+            if (group >> i) & 1:
+                group_cells |= line
+        cells: int = 0
+        if inside_count == k:
+            cells |= group_cells & ~self._regions_mask(inside)
+        if touching_count == k:
+            cells |= self._regions_mask(touching) & ~group_cells
+        return "x", cells & self.free
+    
+    # MARK: _lines_colors
+    def _lines_colors(self, present: list[int], group: int) -> int:
+        colors: int = 0
+        for i, line_colors in enumerate(present):
+            if (group >> i) & 1:
+                colors |= line_colors
+        return colors
+    
+    # MARK: _regions_mask
+    def _regions_mask(self, colors: int) -> int:
+        """Get the cells of the colors whose bits are set in colors."""
+        mask: int = 0
+        for color, region in self.layout.regions.items():
+            if (colors >> color) & 1:
+                mask |= region
+        return mask
+    
+    # MARK: propagate
+    def propagate(self) -> bool:
+        """
+        Apply the deductions of next_deduction until there are none left.
+        
+        @return: False if a color, row or column without a queen has no free cells left.
+        """
+        deduction = self.next_deduction()
+        while deduction is not None:
+            kind, value = deduction
+            if kind == "dead":
+                return False
+            if kind == "queen":
+                self.place(*divmod(value, self.size))
+            else:
+                self.eliminate(value)
+            deduction = self.next_deduction()
+        return True
+
+# MARK: _Layout
+class _Layout:
+    """
+    Bitmasks that only depend on the color board, shared by every state of a search.
+    """
+    
+    def __init__(self, color_board: list[list[int]]) -> None:
+        size: int = len(color_board)
+        
+        self.rows   : list[int] = [((1 << size) - 1) << (x * size) for x in range(size)]
+        self.cols   : list[int] = [sum(1 << (x * size + y) for x in range(size)) for y in range(size)]
+        self.colors : list[int] = [color_board[x][y] for x in range(size) for y in range(size)]  # color of every cell
+        self.regions: dict[int, int] = {}
+        for cell, color in enumerate(self.colors):
+            self.regions[color] = self.regions.get(color, 0) | (1 << cell)
+        
+        # rows, then columns, then colors, see ColoredState
+        self.units: list[int] = self.rows + self.cols + [self.regions[color] for color in range(1, size + 1)]
+        self.cell_units: list[tuple[int, int, int]] = [(cell // size, size + cell % size, 2 * size + color - 1)
+                                                       for cell, color in enumerate(self.colors)]
+        
+        # cells that can not have a queen when cell has one: row, column, color and the touching cells
+        self.attacks: list[int] = []
+        for x in range(size):
+            for y in range(size):
+                mask: int = self.rows[x] | self.cols[y] | self.regions[color_board[x][y]]
+                for i in (x - 1, x + 1):
+                    for j in (y - 1, y + 1):
+                        if 0 <= i < size and 0 <= j < size:
+                            mask |= 1 << (i * size + j)
+                self.attacks.append(mask)
+
+
+# Example usage
+if __name__ == "__main__":
+    board: list[list[int]] = [[6, 6, 6, 6, 6, 6, 6, 6],
+                              [6, 6, 2, 2, 2, 2, 6, 6],
+                              [6, 6, 2, 1, 1, 2, 6, 6],
+                              [6, 5, 2, 2, 2, 2, 6, 6],
+                              [5, 5, 7, 7, 7, 7, 6, 6],
+                              [5, 3, 7, 4, 4, 4, 8, 6],
+                              [5, 3, 7, 7, 7, 7, 8, 6],
+                              [3, 3, 3, 3, 8, 8, 8, 8]
+                              ]
+    print(f"\033[94mSolution: \033[92m{solve(board)}\033[0m")
@@ -0,0 +1,169 @@
+"""
+    Compact encodings for N Queens solutions.
+    
+    A solution is stored as one byte per row (the column of the queen), or as a single integer,
+    its rank among all permutations of board_size columns.
+    
+    Solution files (.nqs) have a 16 byte header followed by fixed size records:
+        magic      : 4 bytes, b"NQS1"
+        board_size : 1 byte
+        padding    : 3 bytes
+        count      : 8 bytes, little endian
+        records    : count * board_size bytes
+    
+    Fixed size records make every solution one slice away, so the files are read through mmap.
+    
+    Made by: NIHAL T P
+    GitHub: https://github.com/nihaltp
+    LinkedIn: https://www.linkedin.com/in/nihal-tp
+"""
+
+import mmap
+import struct
+from typing import Iterable, Iterator
+
+MAGIC : bytes = b"NQS1"
+HEADER: struct.Struct = struct.Struct("<4sB3xQ")
+
+# MARK: pack
+def pack(board: list[int]) -> bytes:
+    """
+    Pack a board into one byte per row.
+    
+    @param board: A board with a queen in every row, at most 256 rows.
+    @return: The packed board.
+    """
+    return bytes(board)
+
+# MARK: unpack
+def unpack(data: bytes) -> list[int]:
+    """
+    Unpack a board packed with pack.
+    
+    @param data: The packed board.
+    @return: The board.
+    """
+    return list(data)
+
+# MARK: rank
+def rank(board: list[int]) -> int:
+    """
+    Get the position of a board among all permutations of its columns, in lexicographic order.
+    
+    @param board: A board with a queen in every row and column.
+    @return: A number from 0 to board_size! - 1.
+    """
+    size: int = len(board)
+    remaining: int = (1 << size) - 1  # columns not used by the rows above
+    result: int = 0
+    for row, col in enumerate(board):
+        # number of unused columns smaller than this one
+        smaller: int = (remaining & ((1 << col) - 1)).bit_count()
+        result = result * (size - row) + smaller
+        remaining &= ~(1 << col)
+    return result
+
+# MARK: unrank
+def unrank(number: int, board_size: int) -> list[int]:
+    """
+    Get the board at a position given by rank.
+    
+    @param number    : The rank of the board.
+    @param board_size: The size of the board.
+    @return: The board.
+    """
+    digits: list[int] = []
+    for base in range(1, board_size + 1):
+        number, digit = divmod(number, base)
+        digits.append(digit)
+    digits.reverse()
+    
+    remaining: list[int] = list(range(board_size))
+    return [remaining.pop(digit) for digit in digits]
+
+# MARK: write_solutions
+def write_solutions(filename: str, board_size: int, boards: Iterable[list[int]]) -> int:
+    """
+    Write solutions to a binary solution file, one record at a time.
+    
+    @param filename  : The file to write, it is replaced if it exists.
+    @param board_size: The size of the boards.
+    @param boards    : The solutions to write.
+    @return: The number of solutions written.
+    """
+    if not 1 <= board_size <= 255:
+        raise ValueError(f"Board size must be between 1 and 255, got {board_size}.")
+    
+    count: int = 0
+    with open(filename, "wb") as f:
+        f.write(HEADER.pack(MAGIC, board_size, 0))  # the count is filled in at the end
+        for board in boards:
+            if len(board) != board_size:
+                raise ValueError(f"Expected a board of size {board_size}, got {len(board)}.")
+            f.write(pack(board))
+            count += 1
+        
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, board_size, count))
+    return count
+
+# MARK: SolutionFile
+class SolutionFile:
+    """
+    Memory-mapped reader for binary solution files.
+    
+    Usage:
+        with SolutionFile("solutions.nqs") as solutions:
+            print(len(solutions), solutions[0])
+    """
+    
+    def __init__(self, filename: str) -> None:
+        self.file = open(filename, "rb")
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access = mmap.ACCESS_READ)
+        except ValueError:
+            # an empty file can not be mapped
+            self.file.close()
+            raise ValueError(f"{filename} is not a solution file.")
+        
+        if len(self.data) < HEADER.size:
+            self.close()
+            raise ValueError(f"{filename} is not a solution file.")
+        
+        magic, self.board_size, self.count = HEADER.unpack_from(self.data)
+        if magic != MAGIC or len(self.data) < HEADER.size + self.count * self.board_size:
+            self.close()
+            raise ValueError(f"{filename} is not a solution file or is incomplete.")
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def __getitem__(self, index: int) -> list[int]:
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("solution index out of range")
+        start: int = HEADER.size + index * self.board_size
+        return unpack(self.data[start : start + self.board_size])
+    
+    def __iter__(self) -> Iterator[list[int]]:
+        for index in range(self.count):
+            yield self[index]
+    
+    def __enter__(self) -> "SolutionFile":
+        return self
+    
+    def __exit__(self, *args) -> None:
+        self.close()
+    
+    # MARK: close
+    def close(self) -> None:
+        if hasattr(self, "data"):
+            self.data.close()
+        self.file.close()
+
+
+# Example usage
+if __name__ == "__main__":
+    board: list[int] = [1, 3, 0, 2]
+    print(f"\033[94m{board}: \033[92mpacked {pack(board)!r}, rank {rank(board)}\033[0m")
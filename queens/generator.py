@@ -0,0 +1,250 @@
+"""
+    Colored Queens puzzle generator.
+    
+    A puzzle is made around a planted solution: the queens are placed first, every queen starts a color
+    region and the regions grow from them until they cover the board. The board is then checked with
+    colored.count_solutions(limit = 2), and while it has a second solution a cell of that solution is
+    given to a neighbouring region, which breaks the second solution but keeps the planted one.
+    
+    Every puzzle is made from its own seed, so the puzzles are spread over a process pool and the same
+    seed always gives the same puzzle.
+    
+    Made by: NIHAL T P
+    GitHub: https://github.com/nihaltp
+    LinkedIn: https://www.linkedin.com/in/nihal-tp
+"""
+
+import random
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterator
+
+from queens import colored
+
+# MARK: generate
+def generate(board_size: int, count: int, workers: int | None = None, seed: int = 0) -> Iterator[list[list[int]]]:
+    """
+    Generate puzzles with exactly one solution.
+    
+    @param board_size: The size of the boards, at least 4 (smaller boards have no puzzle with a solution).
+    @param count     : The number of puzzles to generate.
+    @param workers   : Number of processes, the number of CPUs by default, 1 generates in this process.
+    @param seed      : Puzzle i is made from seed + i.
+    @return: An iterator of color boards, in seed order.
+    """
+    _check_size(board_size)
+    seeds: range = range(seed, seed + count)
+    if workers == 1:
+        yield from (generate_puzzle(board_size, puzzle_seed) for puzzle_seed in seeds)
+        return
+    
+    with ProcessPoolExecutor(max_workers = workers) as executor:
+        yield from executor.map(generate_puzzle, [board_size] * count, seeds)
+
+# MARK: generate_puzzle
+def generate_puzzle(board_size: int, seed: int, repairs: int | None = None) -> list[list[int]]:
+    """
+    Generate one puzzle with exactly one solution.
+    
+    @param board_size: The size of the board, at least 4.
+    @param seed      : The seed of the puzzle.
+    @param repairs   : Number of cells to move to another region before starting over, 10 * board_size by default.
+    @return: The color board.
+    """
+    _check_size(board_size)
+    rng = random.Random(seed)
+    if repairs is None:
+        repairs = 10 * board_size
+    
+    while True:
+        queens: list[int] = random_queens(board_size, rng)
+        board: list[list[int]] = grow_regions(board_size, queens, rng)
+        
+        for _ in range(repairs):
+            found: list[list[int]] = list(islice(colored.solutions(board), 2))
+            if len(found) == 1:
+                return board
+            other: list[int] = found[0] if found[0] != queens else found[1]
+            if not _break_solution(board, queens, other, rng):
+                break
+
+# MARK: random_queens
+def random_queens(board_size: int, rng: random.Random) -> list[int]:
+    """
+    Place board_size queens, one in every row and column and none of them touching.
+    
+    @param board_size: The size of the board, at least 4.
+    @param rng       : The random number generator.
+    @return: The column of the queen in every row.
+    """
+    queens: list[int] = []
+    columns: list[list[int]] = []  # the columns left to try in every row
+    used: set[int] = set()
+    
+    columns.append(rng.sample(range(board_size), board_size))
+    while len(queens) < board_size:
+        if not columns[-1]:
+            # no column left in this row, go back to the row above
+            columns.pop()
+            used.discard(queens.pop())
+            continue
+        
+        column: int = columns[-1].pop()
+        if column in used or (queens and abs(queens[-1] - column) <= 1):
+            continue
+        queens.append(column)
+        used.add(column)
+        if len(queens) < board_size:
+            columns.append(rng.sample(range(board_size), board_size))
+    return queens
+
+# MARK: grow_regions
+def grow_regions(board_size: int, queens: list[int], rng: random.Random) -> list[list[int]]:
+    """
+    Grow one region from every queen, a random cell next to a region joins it until the board is full.
+    
+    @param board_size: The size of the board.
+    @param queens    : The column of the queen in every row, the queen of row x starts color x + 1.
+    @param rng       : The random number generator.
+    @return: The color board.
+    """
+    board: list[list[int]] = [[0 for _ in range(board_size)] for _ in range(board_size)]
+    for x, y in enumerate(queens):
+        board[x][y] = x + 1
+    _fill(board, rng)
+    return board
+
+# MARK: _fill
+def _fill(board: list[list[int]], rng: random.Random) -> None:
+    """Give every cell without a color (0) the color of a region next to it, a random cell at a time."""
+    size: int = len(board)
+    frontier: list[tuple[int, int, int]] = []  # (x, y, color) of the cells next to a region
+    for x in range(size):
+        for y in range(size):
+            if board[x][y]:
+                frontier.extend((i, j, board[x][y]) for i, j in _neighbours(size, x, y) if not board[i][j])
+    
+    while frontier:
+        # swap a random cell to the end, so it can be removed without shifting the list
+        index: int = rng.randrange(len(frontier))
+        frontier[index], frontier[-1] = frontier[-1], frontier[index]
+        x, y, color = frontier.pop()
+        if board[x][y]:
+            continue
+        board[x][y] = color
+        frontier.extend((i, j, color) for i, j in _neighbours(size, x, y) if not board[i][j])
+
+# MARK: _break_solution
+def _break_solution(board: list[list[int]], queens: list[int], other: list[int], rng: random.Random) -> bool:
+    """
+    Give a cell of the other solution to a neighbouring region, so the other solution has two queens in
+    that region. The planted queens are never moved.
+    
+    A cell whose region stays connected is preferred. Otherwise the cell and the cells between it and the
+    nearest other region are given to that region, and the part of its old region cut off from the
+    planted queen is shared out again between the regions around it.
+    
+    @return: False if no cell of the other solution can be moved.
+    """
+    size: int = len(board)
+    planted: set[tuple[int, int]] = set(enumerate(queens))
+    cells: list[tuple[int, int]] = [(x, y) for x, y in enumerate(other) if queens[x] != y]
+    rng.shuffle(cells)
+    
+    for x, y in cells:
+        color: int = board[x][y]
+        targets: list[int] = list({board[i][j] for i, j in _neighbours(size, x, y)} - {color})
+        if not targets:
+            continue
+        
+        board[x][y] = rng.choice(targets)
+        if _connected(board, color):
+            return True
+        board[x][y] = color
+    
+    for x, y in cells:
+        color = board[x][y]
+        path: list[tuple[int, int]] | None = _path_out(board, (x, y), planted)
+        if path is None:
+            continue
+        
+        end_x, end_y = path[-1]
+        target: int = rng.choice([board[i][j] for i, j in _neighbours(size, end_x, end_y) if board[i][j] != color])
+        for i, j in path:
+            board[i][j] = target
+        
+        # the cells of the color that can not reach its planted queen any more lose their color
+        reached: set[tuple[int, int]] = _region(board, next(cell for cell in planted if board[cell[0]][cell[1]] == color))
+        for i in range(size):
+            for j in range(size):
+                if board[i][j] == color and (i, j) not in reached:
+                    board[i][j] = 0
+        _fill(board, rng)
+        return True
+    return False
+
+# MARK: _path_out
+def _path_out(board: list[list[int]], start: tuple[int, int], planted: set[tuple[int, int]]) -> list[tuple[int, int]] | None:
+    """
+    Find the shortest path inside the region of start, from start to a cell next to another region,
+    without going through a planted queen.
+    
+    @return: The cells of the path, None if there is no such path.
+    """
+    size: int = len(board)
+    color: int = board[start[0]][start[1]]
+    previous: dict[tuple[int, int], tuple[int, int] | None] = {start: None}
+    queue: list[tuple[int, int]] = [start]
+    for x, y in queue:
+        if any(board[i][j] != color for i, j in _neighbours(size, x, y)):
+            path: list[tuple[int, int]] = []
+            cell: tuple[int, int] | None = (x, y)
+            while cell is not None:
+                path.append(cell)
+                cell = previous[cell]
+            return path[::-1]
+        
+        for cell in _neighbours(size, x, y):
+            if board[cell[0]][cell[1]] == color and cell not in previous and cell not in planted:
+                previous[cell] = (x, y)
+                queue.append(cell)
+    return None
+
+# MARK: _region
+def _region(board: list[list[int]], start: tuple[int, int]) -> set[tuple[int, int]]:
+    """Get the cells of the same color connected to start."""
+    size: int = len(board)
+    color: int = board[start[0]][start[1]]
+    found: set[tuple[int, int]] = {start}
+    stack: list[tuple[int, int]] = [start]
+    while stack:
+        x, y = stack.pop()
+        for i, j in _neighbours(size, x, y):
+            if board[i][j] == color and (i, j) not in found:
+                found.add((i, j))
+                stack.append((i, j))
+    return found
+
+# MARK: _connected
+def _connected(board: list[list[int]], color: int) -> bool:
+    """Check if the cells of a color are one region."""
+    size: int = len(board)
+    cells: list[tuple[int, int]] = [(x, y) for x in range(size) for y in range(size) if board[x][y] == color]
+    return bool(cells) and len(_region(board, cells[0])) == len(cells)
+
+# MARK: _check_size
+def _check_size(board_size: int) -> None:
+    if board_size < 1 or board_size in (2, 3):
+        raise ValueError(f"There are no colored puzzles of size {board_size}.")
+
+# MARK: _neighbours
+def _neighbours(size: int, x: int, y: int) -> list[tuple[int, int]]:
+    return [(i, j) for i, j in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)) if 0 <= i < size and 0 <= j < size]
+
+
+# Example usage
+if __name__ == "__main__":
+    puzzle: list[list[int]] = generate_puzzle(8, 0)
+    for row in puzzle:
+        print(f"\033[94m{row}\033[0m")
+    print(f"\033[92mSolution: {colored.solve(puzzle)}\033[0m")
@@ -0,0 +1,667 @@
+"""
+    Bitmask N Queens engine.
+    
+    Columns and both diagonals are kept as integer bitmasks, so checking a square is a single AND
+    instead of a scan over every queen placed so far.
+    
+    A board is a list where the index is the row and the value is the column of the queen in that row.
+    -1 means there is no queen in that row yet.
+    
+    A partial board has queens in any rows, -1 in the others. Its queens are seeded into the masks once,
+    with the diagonals kept by their absolute index, and only the free rows are searched
+    (see count_completions and search_partial).
+    
+    Made by: NIHAL T P
+    GitHub: https://github.com/nihaltp
+    LinkedIn: https://www.linkedin.com/in/nihal-tp
+"""
+
+from itertools import islice
+from typing import Iterator
+
+# MARK: count_solutions
+def count_solutions(board_size: int, prefix: list[int] | None = None) -> int:
+    """
+    Count all the solutions of the board_size-Queens problem.
+    
+    @param board_size: The size of the board.
+    @param prefix    : Columns of the queens in the first rows, only solutions starting with them are counted.
+    @return: The number of solutions.
+    """
+    if board_size < 1:
+        return 0
+    
+    full: int = (1 << board_size) - 1
+    masks = _seed(board_size, prefix or [])
+    if masks is None:
+        return 0
+    
+    def count(cols: int, left: int, right: int) -> int:
+        if cols == full:
+            return 1
+        
+        total: int = 0
+        available: int = full & ~(cols | left | right)
+        while available:
+            bit = available & -available  # lowest free square
+            available ^= bit
+            total += count(cols | bit, ((left | bit) << 1) & full, (right | bit) >> 1)
+        return total
+    
+    return count(*masks)
+
+# MARK: _seed
+def _seed(board_size: int, prefix: list[int]) -> tuple[int, int, int] | None:
+    """
+    Place the queens of prefix in the first rows.
+    
+    @param board_size: The size of the board.
+    @param prefix    : Columns of the queens in the first rows.
+    @return: The occupied (columns, left diagonals, right diagonals) of the next row, None if the queens attack each other.
+    """
+    full : int = (1 << board_size) - 1
+    cols : int = 0
+    left : int = 0
+    right: int = 0
+    
+    for col in prefix:
+        if not 0 <= col < board_size:
+            return None
+        bit: int = 1 << col
+        if (cols | left | right) & bit:
+            return None
+        cols  = cols | bit
+        left  = ((left | bit) << 1) & full
+        right = (right | bit) >> 1
+    
+    return cols, left, right
+
+# MARK: count_completions
+def count_completions(board_size: int, partial: list[int], limit: int | None = None) -> int:
+    """
+    Count the solutions that keep the queens of a partial board.
+    
+    @param board_size: The size of the board.
+    @param partial   : Column of the queen in every row, -1 for a free row, missing rows at the end are free.
+    @param limit     : Stop counting at this many solutions, all of them by default.
+    @return: The number of solutions, 0 right away if the queens attack each other or a free row or column
+             has no safe square left.
+    """
+    return count_completions_bounded(board_size, partial, limit)[0]
+
+# MARK: count_completions_bounded
+def count_completions_bounded(board_size: int, partial: list[int], limit: int | None = None,
+                              budget: int | None = None) -> tuple[int, bool]:
+    """
+    Count the solutions that keep the queens of a partial board, placing at most budget queens,
+    so the time it takes does not depend on the size of the board (e.g. for a hint drawn in one frame).
+    
+    @param board_size: The size of the board.
+    @param partial   : Column of the queen in every row, -1 for a free row, missing rows at the end are free.
+    @param limit     : Stop counting at this many solutions, all of them by default.
+    @param budget    : Maximum number of queens to place, no maximum by default.
+    @return: (number of solutions, False if the budget ran out first and there may be more of them).
+    """
+    seeded = _seed_partial(board_size, partial)
+    if seeded is None:
+        return 0, True
+    cols, diag, anti, free_rows = seeded
+    if not free_rows:
+        return 1, True
+    if limit is None and budget is None and free_rows[0] == board_size - len(free_rows):
+        # the queens are in the first rows, the shifting masks of count_solutions are faster
+        return count_solutions(board_size, list(partial[:free_rows[0]])), True
+    
+    full: int = (1 << board_size) - 1
+    # the rows with the fewest safe squares first, (row, shift of the anti diagonals) for every free row
+    free_rows.sort(key = lambda row: _available(board_size, row, cols, diag, anti).bit_count())
+    rows: list[tuple[int, int]] = [(row, board_size - 1 - row) for row in free_rows]
+    last: int = len(rows) - 1
+    left: list[int] = [-1 if budget is None else budget]  # queens that may still be placed, -1 for no maximum
+    
+    def count(index: int, cols: int, diag: int, anti: int, wanted: int) -> int:
+        row, shift = rows[index]
+        available: int = full & ~(cols | (diag >> row) | (anti >> shift))
+        if index == last:
+            return min(available.bit_count(), wanted)
+        
+        total: int = 0
+        while available and total < wanted and left[0]:
+            left[0] -= 1
+            bit = available & -available  # lowest free square
+            available ^= bit
+            total += count(index + 1, cols | bit, diag | (bit << row), anti | (bit << shift), wanted - total)
+        return total
+    
+    total: int = count(0, cols, diag, anti, board_size ** board_size if limit is None else limit)
+    return total, left[0] != 0 or total == limit
+
+# MARK: _seed_partial
+def _seed_partial(board_size: int, partial: list[int]) -> tuple[int, int, int, list[int]] | None:
+    """
+    Place the queens of a partial board.
+    
+    The diagonal of (row, col) is bit row + col of diag, its anti diagonal is bit col - row + board_size - 1 of anti.
+    
+    @param board_size: The size of the board.
+    @param partial   : Column of the queen in every row, -1 for a free row, missing rows at the end are free.
+    @return: The occupied (columns, diagonals, anti diagonals) and the free rows,
+             None if the queens attack each other or a free row or column has no safe square left.
+    """
+    if len(partial) > board_size:
+        return None
+    
+    full: int = (1 << board_size) - 1
+    cols: int = 0
+    diag: int = 0
+    anti: int = 0
+    free_rows: list[int] = list(range(len(partial), board_size))
+    
+    for row, col in enumerate(partial):
+        if col == -1:
+            free_rows.append(row)
+            continue
+        if not 0 <= col < board_size:
+            return None
+        
+        bit: int = 1 << col
+        if cols & bit or (diag >> row) & bit or (anti >> (board_size - 1 - row)) & bit:
+            return None
+        cols |= bit
+        diag |= bit << row
+        anti |= bit << (board_size - 1 - row)
+    
+    # every free row needs a safe square, and every free column needs a free row where it is safe
+    safe: int = 0
+    for row in free_rows:
+        available: int = _available(board_size, row, cols, diag, anti)
+        if not available:
+            return None
+        safe |= available
+    if full & ~cols & ~safe:
+        return None
+    
+    free_rows.sort()
+    return cols, diag, anti, free_rows
+
+# MARK: _available
+def _available(board_size: int, row: int, cols: int, diag: int, anti: int) -> int:
+    """Get the safe squares of a row as a bitmask of columns, see _seed_partial."""
+    return ((1 << board_size) - 1) & ~(cols | (diag >> row) | (anti >> (board_size - 1 - row)))
+
+# MARK: count_symmetric
+def count_symmetric(board_size: int) -> tuple[int, int]:
+    """
+    Count the solutions of the board_size-Queens problem using the symmetries of the board.
+    
+    Only one solution of every rotation/reflection class is searched for, and it is counted
+    as 2, 4 or 8 solutions depending on how many different boards its class has.
+    This is about 8 times faster than count_solutions for big boards.
+    
+    @param board_size: The size of the board.
+    @return: (all solutions, unique solutions)
+    """
+    if board_size < 5:
+        # too small for the symmetry search, the corner and side cases overlap
+        all_solutions: list[list[int]] = list(solutions(board_size))
+        return len(all_solutions), len({canonical(board) for board in all_solutions})
+    
+    search = _SymmetrySearch(board_size)
+    for kind, bound1 in _symmetric_cases(board_size):
+        if kind == "corner":
+            search.corner(bound1)
+        else:
+            search.side(bound1)
+    return search.total(), search.unique()
+
+# MARK: fundamental_solutions
+def fundamental_solutions(board_size: int) -> Iterator[tuple[list[int], int]]:
+    """
+    Yield one solution of every rotation/reflection class, with the number of solutions in its class.
+    
+    Only one board of every class is searched for, the other boards of the class are never visited.
+    
+    @param board_size: The size of the board.
+    @return: An iterator of (canonical board, multiplicity), the multiplicity is 2, 4 or 8 (1 for a single queen).
+    """
+    if board_size < 5:
+        # too small for the symmetry search, group the solutions instead
+        classes: dict[tuple[int, ...], int] = {}
+        for board in solutions(board_size):
+            classes.setdefault(canonical(board), len(set(symmetries(board))))
+        for board, multiplicity in classes.items():
+            yield list(board), multiplicity
+        return
+    
+    for kind, bound1 in _symmetric_cases(board_size):
+        search = _SymmetrySearch(board_size, record = True)
+        if kind == "corner":
+            search.corner(bound1)
+        else:
+            search.side(bound1)
+        for board, multiplicity in search.found:
+            yield list(canonical(board)), multiplicity
+
+# MARK: _symmetric_cases
+def _symmetric_cases(board_size: int) -> list[tuple[str, int]]:
+    """
+    Get the corner and side cases that the symmetry search is split into.
+    
+    @param board_size: The size of the board, at least 5.
+    @return: A list of ("corner" or "side", bound1).
+    """
+    cases: list[tuple[str, int]] = [("corner", bound1) for bound1 in range(2, board_size - 1)]
+    cases.extend(("side", bound1) for bound1 in range(1, board_size // 2))
+    return cases
+
+# MARK: symmetries
+def symmetries(board: list[int]) -> list[tuple[int, ...]]:
+    """
+    Get the 8 rotations/reflections of a full board, some of them may be the same.
+    
+    @param board: A board with a queen in every row.
+    @return: A list of boards as tuples.
+    """
+    size: int = len(board)
+    forms: list[tuple[int, ...]] = []
+    current: list[int] = list(board)
+    for _ in range(4):
+        forms.append(tuple(current))
+        forms.append(tuple(reversed(current)))  # mirror top to bottom
+        # rotate 90 degrees: the queen at (row, col) moves to (col, size - 1 - row)
+        rotated: list[int] = [0 for _ in range(size)]
+        for row, col in enumerate(current):
+            rotated[col] = size - 1 - row
+        current = rotated
+    return forms
+
+# MARK: canonical
+def canonical(board: list[int]) -> tuple[int, ...]:
+    """
+    Get the smallest of the 8 rotations/reflections of a full board.
+    
+    @param board: A board with a queen in every row.
+    @return: The canonical board as a tuple.
+    """
+    return min(symmetries(board))
+
+# MARK: _SymmetrySearch
+class _SymmetrySearch:
+    """
+    Search for one solution of every symmetry class (Takaken's algorithm).
+    
+    self.board keeps one bit per row, the bit of the column the queen is in.
+    
+    Solutions are split in two cases:
+        corner: the queen of the first row is in the corner, the class can only have 8 boards
+        side  : the queen of the first row is away from the corners, and no other edge queen is closer to a corner
+    """
+    
+    def __init__(self, board_size: int, record: bool = False) -> None:
+        self.size   : int = board_size
+        self.last   : int = board_size - 1
+        self.mask   : int = (1 << board_size) - 1
+        self.topbit : int = 1 << self.last
+        self.board  : list[int] = [0 for _ in range(board_size)]
+        
+        self.bound1   : int = 0
+        self.bound2   : int = 0
+        self.sidemask : int = 0
+        self.lastmask : int = 0
+        self.endbit   : int = 0
+        
+        # number of classes with 2, 4 and 8 different boards
+        self.count2 : int = 0
+        self.count4 : int = 0
+        self.count8 : int = 0
+        
+        # the boards found and their multiplicity, only kept when record is True
+        self.record : bool = record
+        self.found  : list[tuple[list[int], int]] = []
+    
+    # MARK: total
+    def total(self) -> int:
+        return 2 * self.count2 + 4 * self.count4 + 8 * self.count8
+    
+    # MARK: unique
+    def unique(self) -> int:
+        return self.count2 + self.count4 + self.count8
+    
+    # MARK: corner
+    def corner(self, bound1: int, branches: int = -1) -> None:
+        """
+        Search the boards with a queen in the corner of the first row and in column bound1 of the second row.
+        
+        @param bound1  : Column of the queen in the second row, from 2 to board_size - 2.
+        @param branches: Bitmask of the columns to try in the third row, all of them by default.
+        """
+        self.bound1 = bound1
+        bit: int = 1 << bound1
+        self.board[0] = 1
+        self.board[1] = bit
+        self._backtrack_corner(2, (2 | bit) << 1, 1 | bit, bit >> 1, branches)
+    
+    # MARK: side
+    def side(self, bound1: int, branches: int = -1) -> None:
+        """
+        Search the boards with the queen of the first row in column bound1.
+        
+        @param bound1  : Column of the queen in the first row, from 1 to below half of the board.
+        @param branches: Bitmask of the columns to try in the second row, all of them by default.
+        """
+        self.bound1   = bound1
+        self.bound2   = self.last - bound1
+        self.sidemask = self.topbit | 1
+        self.endbit   = self.topbit >> bound1
+        
+        # the last row may not use the squares this close to the corners
+        self.lastmask = self.topbit | 1
+        for _ in range(bound1 - 1):
+            self.lastmask |= self.lastmask >> 1 | self.lastmask << 1
+        
+        bit: int = 1 << bound1
+        self.board[0] = bit
+        self._backtrack_side(1, bit << 1, bit, bit >> 1, branches)
+    
+    # MARK: _backtrack_corner
+    def _backtrack_corner(self, row: int, left: int, down: int, right: int, branches: int = -1) -> None:
+        available: int = self.mask & ~(left | down | right) & branches
+        
+        if row == self.last:
+            if available:
+                self.board[row] = available
+                self.count8 += 1
+                if self.record:
+                    self._record(8)
+            return
+        
+        if row < self.bound1:
+            # keep the second column free above bound1, the other half is the diagonal mirror
+            available &= ~2
+        
+        while available:
+            bit = available & -available
+            available ^= bit
+            self.board[row] = bit
+            self._backtrack_corner(row + 1, (left | bit) << 1, down | bit, (right | bit) >> 1)
+    
+    # MARK: _backtrack_side
+    def _backtrack_side(self, row: int, left: int, down: int, right: int, branches: int = -1) -> None:
+        available: int = self.mask & ~(left | down | right) & branches
+        
+        if row == self.last:
+            if available and not (available & self.lastmask):
+                self.board[row] = available
+                self._check()
+            return
+        
+        if row < self.bound1:
+            # no queen on the side edges above bound1
+            available &= ~self.sidemask
+        elif row == self.bound2:
+            if not (down & self.sidemask):
+                return
+            if (down & self.sidemask) != self.sidemask:
+                available &= self.sidemask
+        
+        while available:
+            bit = available & -available
+            available ^= bit
+            self.board[row] = bit
+            self._backtrack_side(row + 1, (left | bit) << 1, down | bit, (right | bit) >> 1)
+    
+    # MARK: _check
+    def _check(self) -> None:
+        """Count the board if it is the smallest of its class, and find how many boards its class has."""
+        board  : list[int] = self.board
+        last   : int = self.last
+        
+        # 90 degree rotation
+        if board[self.bound2] == 1:
+            own: int = 1
+            ptn: int = 2
+            while own <= last:
+                bit: int = 1
+                you: int = last
+                while board[you] != ptn and board[own] >= bit:
+                    bit <<= 1
+                    you -= 1
+                if board[own] > bit:
+                    return
+                if board[own] < bit:
+                    break
+                own += 1
+                ptn <<= 1
+            if own > last:
+                self.count2 += 1
+                if self.record:
+                    self._record(2)
+                return
+        
+        # 180 degree rotation
+        if board[last] == self.endbit:
+            own = 1
+            you = last - 1
+            while own <= last:
+                bit = 1
+                ptn = self.topbit
+                while ptn != board[you] and board[own] >= bit:
+                    bit <<= 1
+                    ptn >>= 1
+                if board[own] > bit:
+                    return
+                if board[own] < bit:
+                    break
+                own += 1
+                you -= 1
+            if own > last:
+                self.count4 += 1
+                if self.record:
+                    self._record(4)
+                return
+        
+        # 270 degree rotation
+        if board[self.bound1] == self.topbit:
+            own = 1
+            ptn = self.topbit >> 1
+            while own <= last:
+                bit = 1
+                you = 0
+                while board[you] != ptn and board[own] >= bit:
+                    bit <<= 1
+                    you += 1
+                if board[own] > bit:
+                    return
+                if board[own] < bit:
+                    break
+                own += 1
+                ptn >>= 1
+        
+        self.count8 += 1
+        if self.record:
+            self._record(8)
+    
+    # MARK: _record
+    def _record(self, multiplicity: int) -> None:
+        self.found.append(([bit.bit_length() - 1 for bit in self.board], multiplicity))
+
+# MARK: solutions
+def solutions(board_size: int, prefix: list[int] | None = None, limit: int | None = None, offset: int = 0,
+              stats: dict | None = None) -> Iterator[list[int]]:
+    """
+    Yield the solutions of the board_size-Queens problem as they are found.
+    
+    Nothing is kept between solutions, so memory does not grow with the number of solutions.
+    
+    @param board_size: The size of the board.
+    @param prefix    : Columns of the queens in the first rows, only solutions starting with them are yielded.
+    @param limit     : Maximum number of solutions to yield, all of them by default.
+    @param offset    : Number of solutions to skip first.
+    @param stats     : If given, the counters of the search are added to it, see queens.stats.
+    @return: An iterator of boards, each one a new list.
+    """
+    found = (board.copy() for event, board in search(board_size, prefix, stats) if event == "solution")
+    yield from islice(found, offset, None if limit is None else offset + limit)
+
+# MARK: search
+def search(board_size: int, prefix: list[int] | None = None, stats: dict | None = None) -> Iterator[tuple[str, list[int]]]:
+    """
+    Walk the search tree one step at a time.
+    
+    Every step yields an event and the board after that step:
+        "place"    : a queen was placed in the next row
+        "solution" : a queen was placed in the last row, the board is a solution
+        "backtrack": a row ran out of free squares and its queen was removed
+    
+    The same board list is updated in place between steps, copy it if you need to keep it.
+    
+    @param board_size: The size of the board.
+    @param prefix    : Columns of the queens in the first rows, they are never moved.
+    @param stats     : If given, nodes, rejects, backtracks and solutions are counted in it, see queens.stats.
+    @return: An iterator of (event, board) tuples.
+    """
+    prefix = prefix or []
+    if board_size < 1 or len(prefix) > board_size:
+        return
+    
+    masks = _seed(board_size, prefix)
+    if masks is None:
+        return
+    
+    full: int = (1 << board_size) - 1
+    board: list[int] = list(prefix) + [-1 for _ in range(board_size - len(prefix))]
+    
+    start: int = len(prefix)
+    if start == board_size:
+        if stats is not None:
+            stats["solutions"] = stats.get("solutions", 0) + 1
+        yield "solution", board
+        return
+    
+    if stats is not None:
+        for name in ("nodes", "rejects", "backtracks", "solutions"):
+            stats.setdefault(name, 0)
+    
+    # occupied columns and diagonals for every row, and the squares still to try in it
+    cols     : list[int] = [0 for _ in range(board_size)]
+    left     : list[int] = [0 for _ in range(board_size)]
+    right    : list[int] = [0 for _ in range(board_size)]
+    available: list[int] = [0 for _ in range(board_size)]
+    cols[start], left[start], right[start] = masks
+    available[start] = full & ~(cols[start] | left[start] | right[start])
+    if stats is not None:
+        stats["rejects"] += board_size - available[start].bit_count()
+    
+    row: int = start
+    while row >= start:
+        if not available[row]:
+            # no free squares left, backtrack to the previous row
+            if board[row] != -1:
+                board[row] = -1
+                if stats is not None:
+                    stats["backtracks"] += 1
+                yield "backtrack", board
+            row -= 1
+            continue
+        
+        bit = available[row] & -available[row]  # lowest free square
+        available[row] ^= bit
+        board[row] = bit.bit_length() - 1
+        if stats is not None:
+            stats["nodes"] += 1
+        
+        if row == board_size - 1:
+            if stats is not None:
+                stats["solutions"] += 1
+            yield "solution", board
+            continue
+        
+        yield "place", board
+        
+        cols[row + 1]  = cols[row] | bit
+        left[row + 1]  = ((left[row] | bit) << 1) & full
+        right[row + 1] = (right[row] | bit) >> 1
+        row += 1
+        board[row] = -1
+        available[row] = full & ~(cols[row] | left[row] | right[row])
+        if stats is not None:
+            stats["rejects"] += board_size - available[row].bit_count()
+
+# MARK: search_partial
+def search_partial(board_size: int, partial: list[int], stats: dict | None = None) -> Iterator[tuple[str, list[int]]]:
+    """
+    Walk the search tree of the completions of a partial board one step at a time, like search.
+    
+    The queens of the partial board are seeded into the masks once and never moved, only the free rows are searched.
+    Nothing is yielded if the partial board has no completion that _seed_partial can rule out right away.
+    
+    @param board_size: The size of the board.
+    @param partial   : Column of the queen in every row, -1 for a free row, missing rows at the end are free.
+    @param stats     : If given, nodes, rejects, backtracks and solutions are counted in it, see queens.stats.
+    @return: An iterator of (event, board) tuples, the same board list is updated in place between steps.
+    """
+    seeded = _seed_partial(board_size, partial)
+    if seeded is None:
+        return
+    
+    board: list[int] = list(partial) + [-1 for _ in range(board_size - len(partial))]
+    if stats is not None:
+        for name in ("nodes", "rejects", "backtracks", "solutions"):
+            stats.setdefault(name, 0)
+    
+    masks, free_rows = seeded[:3], seeded[3]
+    if not free_rows:
+        if stats is not None:
+            stats["solutions"] += 1
+        yield "solution", board
+        return
+    
+    # the occupied (columns, diagonals, anti diagonals) when every free row is reached, and the squares still to try in it
+    last: int = len(free_rows) - 1
+    occupied : list[tuple[int, int, int]] = [masks for _ in free_rows]
+    available: list[int] = [0 for _ in free_rows]
+    available[0] = _available(board_size, free_rows[0], *masks)
+    if stats is not None:
+        stats["rejects"] += board_size - available[0].bit_count()
+    
+    index: int = 0
+    while index >= 0:
+        row: int = free_rows[index]
+        if not available[index]:
+            # no free squares left, backtrack to the previous free row
+            if board[row] != -1:
+                board[row] = -1
+                if stats is not None:
+                    stats["backtracks"] += 1
+                yield "backtrack", board
+            index -= 1
+            continue
+        
+        bit = available[index] & -available[index]  # lowest free square
+        available[index] ^= bit
+        board[row] = bit.bit_length() - 1
+        if stats is not None:
+            stats["nodes"] += 1
+        
+        if index == last:
+            if stats is not None:
+                stats["solutions"] += 1
+            yield "solution", board
+            continue
+        
+        yield "place", board
+        
+        cols, diag, anti = occupied[index]
+        occupied[index + 1] = (cols | bit, diag | (bit << row), anti | (bit << (board_size - 1 - row)))
+        index += 1
+        board[free_rows[index]] = -1
+        available[index] = _available(board_size, free_rows[index], *occupied[index])
+        if stats is not None:
+            stats["rejects"] += board_size - available[index].bit_count()
+
+
+# Example usage
+if __name__ == "__main__":
+    for size in range(1, 13):
+        total, unique = count_symmetric(size)
+        print(f"\033[94m{size}-Queens: \033[92m{total} solutions, {unique} unique\033[0m")
@@ -0,0 +1,204 @@
+"""
+    Multi-process N Queens engine.
+    
+    The search tree is split by the placement of the first queens, every subtree is solved in a
+    separate process and the results are merged in the same order the single process engine uses.
+    
+    Made by: NIHAL T P
+    GitHub: https://github.com/nihaltp
+    LinkedIn: https://www.linkedin.com/in/nihal-tp
+"""
+
+import os
+import signal
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing.pool import AsyncResult
+from itertools import islice
+from typing import Callable, Iterator
+
+from queens import nqueens
+
+# MARK: count_solutions
+def count_solutions(board_size: int, workers: int | None = None) -> int:
+    """
+    Count all the solutions of the board_size-Queens problem, split by the first two queens.
+    
+    @param board_size: The size of the board.
+    @param workers   : Number of processes, the number of CPUs by default.
+    @return: The number of solutions.
+    """
+    prefixes: list[list[int]] = _prefixes(board_size)
+    if not prefixes:
+        return nqueens.count_solutions(board_size)
+    
+    with ProcessPoolExecutor(max_workers = workers) as executor:
+        return sum(executor.map(nqueens.count_solutions, [board_size] * len(prefixes), prefixes))
+
+# MARK: count_symmetric
+def count_symmetric(board_size: int, workers: int | None = None, poll: Callable[[], None] | None = None) -> tuple[int, int]:
+    """
+    Count the solutions of the board_size-Queens problem using the symmetries of the board,
+    with every corner/side case split by the placement of its next queen.
+    
+    @param board_size: The size of the board.
+    @param workers   : Number of processes, the number of CPUs by default.
+    @param poll      : Called about 60 times per second while the processes count, e.g. to keep a window responding.
+                       If it raises, the processes are stopped and the count is given up.
+    @return: (all solutions, unique solutions)
+    """
+    if board_size < 5:
+        return nqueens.count_symmetric(board_size)
+    
+    tasks: list[tuple[str, int, int]] = _symmetric_tasks(board_size)
+    
+    count2: int = 0
+    count4: int = 0
+    count8: int = 0
+    # one task at a time, the expensive ones first, so the last tasks to finish are short ones
+    tasks.sort(key = _cost_order)
+    # a Pool, not a ProcessPoolExecutor, so the processes can be stopped when poll raises,
+    # the workers get back the default SIGTERM, pygame catches it in the window that forked them
+    pool = multiprocessing.Pool(workers, initializer = signal.signal, initargs = (signal.SIGTERM, signal.SIG_DFL))
+    try:
+        results: list[AsyncResult] = [pool.apply_async(_symmetric_task, (board_size, task)) for task in tasks]
+        for result in results:
+            while poll is not None and not result.ready():
+                poll()
+                result.wait(1 / 60)
+            counts = result.get()
+            count2 += counts[0]
+            count4 += counts[1]
+            count8 += counts[2]
+    except BaseException:
+        # e.g. the window was closed in poll, stop the processes instead of waiting for the tasks they are running
+        pool.terminate()
+        raise
+    pool.close()
+    pool.join()
+    
+    return 2 * count2 + 4 * count4 + 8 * count8, count2 + count4 + count8
+
+# MARK: fundamental_solutions
+def fundamental_solutions(board_size: int, workers: int | None = None) -> Iterator[tuple[list[int], int]]:
+    """
+    Yield one solution of every rotation/reflection class with its multiplicity,
+    in the same order as nqueens.fundamental_solutions.
+    
+    @param board_size: The size of the board.
+    @param workers   : Number of processes, the number of CPUs by default.
+    @return: An iterator of (canonical board, multiplicity).
+    """
+    if board_size < 5:
+        yield from nqueens.fundamental_solutions(board_size)
+        return
+    
+    tasks: list[tuple[str, int, int]] = _symmetric_tasks(board_size)
+    with ProcessPoolExecutor(max_workers = workers) as executor:
+        # submitted the expensive ones first, read in the order of the tasks
+        futures: dict[int, Future] = {}
+        for index in sorted(range(len(tasks)), key = lambda index: _cost_order(tasks[index])):
+            futures[index] = executor.submit(_fundamental_task, board_size, tasks[index])
+        
+        for index in range(len(tasks)):
+            for board, multiplicity in futures.pop(index).result():
+                yield list(nqueens.canonical(board)), multiplicity
+
+# MARK: solutions
+def solutions(board_size: int, workers: int | None = None, limit: int | None = None, offset: int = 0) -> Iterator[list[int]]:
+    """
+    Yield the solutions of the board_size-Queens problem, in the same order as nqueens.solutions.
+    
+    @param board_size: The size of the board.
+    @param workers   : Number of processes, the number of CPUs by default.
+    @param limit     : Maximum number of solutions to yield, all of them by default.
+    @param offset    : Number of solutions to skip first.
+    @return: An iterator of boards.
+    """
+    prefixes: list[list[int]] = _prefixes(board_size)
+    if not prefixes:
+        yield from nqueens.solutions(board_size, limit = limit, offset = offset)
+        return
+    
+    yield from islice(_solutions(board_size, prefixes, workers), offset, None if limit is None else offset + limit)
+
+# MARK: _solutions
+def _solutions(board_size: int, prefixes: list[list[int]], workers: int | None) -> Iterator[list[int]]:
+    executor = ProcessPoolExecutor(max_workers = workers)
+    # only 2 subtrees per process are in flight, a slow reader does not make the finished ones pile up here
+    in_flight: int = 2 * (workers or os.cpu_count() or 1)
+    waiting: Iterator[list[int]] = iter(prefixes)
+    pending: deque[Future] = deque(executor.submit(_solutions_task, board_size, prefix) for prefix in islice(waiting, in_flight))
+    try:
+        # the futures are read in the order of the prefixes, so the output does not depend on which process finishes first
+        while pending:
+            found: list[list[int]] = pending.popleft().result()
+            for prefix in islice(waiting, 1):
+                pending.append(executor.submit(_solutions_task, board_size, prefix))
+            yield from found
+    finally:
+        # stop the subtrees that were not started yet when the caller stops early
+        executor.shutdown(cancel_futures = True)
+
+# MARK: _prefixes
+def _prefixes(board_size: int) -> list[list[int]]:
+    """
+    Get every valid placement of the first two queens, in search order.
+    
+    @param board_size: The size of the board.
+    @return: A list of [first column, second column], empty for boards too small to split.
+    """
+    if board_size < 4:
+        return []
+    return [[first, second] for first in range(board_size) for second in range(board_size)
+            if abs(first - second) > 1]
+
+# MARK: _symmetric_tasks
+def _symmetric_tasks(board_size: int) -> list[tuple[str, int, int]]:
+    """
+    Split every corner/side case of the symmetry search by the column of its next queen.
+    
+    @param board_size: The size of the board, at least 5.
+    @return: A list of ("corner" or "side", bound1, branches).
+    """
+    return [(kind, bound1, 1 << col) for kind, bound1 in nqueens._symmetric_cases(board_size) for col in range(board_size)]
+
+# MARK: _cost_order
+def _cost_order(task: tuple[str, int, int]) -> tuple[bool, int]:
+    """
+    Sort key putting the most expensive tasks first: the side cases cost more than the corner cases,
+    and both cost more the closer their second queen is to the corner (smaller bound1).
+    """
+    kind, bound1, _ = task
+    return kind != "side", bound1
+
+# MARK: _solutions_task
+def _solutions_task(board_size: int, prefix: list[int]) -> list[list[int]]:
+    return list(nqueens.solutions(board_size, prefix))
+
+# MARK: _symmetric_task
+def _symmetric_task(board_size: int, task: tuple[str, int, int]) -> tuple[int, int, int]:
+    search = _run_symmetric(board_size, task, False)
+    return search.count2, search.count4, search.count8
+
+# MARK: _fundamental_task
+def _fundamental_task(board_size: int, task: tuple[str, int, int]) -> list[tuple[list[int], int]]:
+    return _run_symmetric(board_size, task, True).found
+
+# MARK: _run_symmetric
+def _run_symmetric(board_size: int, task: tuple[str, int, int], record: bool) -> "nqueens._SymmetrySearch":
+    kind, bound1, branches = task
+    search = nqueens._SymmetrySearch(board_size, record)
+    if kind == "corner":
+        search.corner(bound1, branches)
+    else:
+        search.side(bound1, branches)
+    return search
+
+
+# Example usage
+if __name__ == "__main__":
+    size: int = 14
+    total, unique = count_symmetric(size)
+    print(f"\033[94m{size}-Queens on {os.cpu_count()} CPUs: \033[92m{total} solutions, {unique} unique\033[0m")
@@ -0,0 +1,73 @@
+"""
+    Opt-in instrumentation for the searches.
+    
+    The engines take stats = None by default and count nothing. Pass a SearchStats (or any dict)
+    to get the counters of a run:
+        nodes                   : queens placed by the search
+        rejects                 : squares a queen could not go to (N Queens)
+        backtracks              : placements undone because they led nowhere
+        solutions               : solutions found
+        units_checked           : rows, columns and colors checked by the deduction rules (colored)
+        confinement_passes      : times the confinement rules were checked (colored)
+        rule.<name>             : deductions found by every rule (colored)
+        dead                    : states found to have no solution by the rules (colored)
+        time.<phase>            : seconds spent in a phase, see SearchStats.phase
+    
+    Made by: NIHAL T P
+    GitHub: https://github.com/nihaltp
+    LinkedIn: https://www.linkedin.com/in/nihal-tp
+"""
+
+import json
+import time
+import contextlib
+from typing import Iterator
+
+# MARK: SearchStats
+class SearchStats(dict):
+    """
+    Counters and phase timers of a search, name -> number.
+    It is a dict, so it is read like one and json.dumps works on it directly.
+    
+    Usage:
+        stats = SearchStats()
+        with stats.phase("solve"):
+            colored.solve(board, stats)
+        print(stats["nodes"], stats["time.solve"])
+    """
+    
+    # MARK: count
+    def count(self, name: str, amount: int = 1) -> None:
+        """Add amount to a counter, starting at 0."""
+        self[name] = self.get(name, 0) + amount
+    
+    # MARK: phase
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Add the wall time of the with block to "time.<name>", a phase can be timed many times."""
+        start: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            self[f"time.{name}"] = self.get(f"time.{name}", 0.0) + time.perf_counter() - start
+    
+    # MARK: to_json
+    def to_json(self) -> str:
+        return json.dumps(dict(sorted(self.items())), indent = 2)
+    
+    # MARK: dump
+    def dump(self, filename: str) -> None:
+        """Save the stats to a JSON file."""
+        with open(filename, "w") as f:
+            f.write(self.to_json() + "\n")
+
+
+# Example usage
+if __name__ == "__main__":
+    from queens import nqueens
+    
+    stats = SearchStats()
+    with stats.phase("search"):
+        for _ in nqueens.search(8, stats = stats):
+            pass
+    print(f"\033[94m{stats.to_json()}\033[0m")